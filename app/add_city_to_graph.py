@@ -2,8 +2,8 @@
 Add a city to the weather graph.
 
 This module provides a command-line interface to add cities to the Apache AGE
-graph. It creates Temperature, Humidity, and Precipitation nodes with
-relationship edges for the specified city.
+graph. It creates Temperature and Humidity nodes with relationship edges
+for the specified city.
 
 Usage:
     # Using city name (geocoded to coordinates automatically)
@@ -11,6 +11,9 @@ Usage:
     python -m app.add_city_to_graph "San Diego, CA"
     python -m app.add_city_to_graph "Seattle" --days 14
 
+    # Adding several cities at once (processed concurrently)
+    python -m app.add_city_to_graph "Denver" "Seattle" "Boston, MA"
+
     # Using explicit coordinates (bypasses geocoding)
     python -m app.add_city_to_graph --lat 39.7392 --lon -104.9903 --city "Denver" --state "CO"
 
@@ -21,13 +24,43 @@ Note:
 
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from .config import get_logger, API_BASE_URL
+from .config import get_logger, API_BASE_URL, API_CONNECT_TIMEOUT, API_READ_TIMEOUT
 from .location_resolver import resolve_location, validate_coordinates
 
 logger = get_logger(__name__)
 
+# Maximum number of cities processed at once by add_cities_bulk. Kept small so
+# the API (and the geocoding/weather.gov services behind it) isn't flooded.
+BULK_MAX_WORKERS = 4
+
+# Retry policy for transient API failures: connection errors and 502/503/504
+# responses are retried with exponential backoff (0.5s, 1s, 2s, ...). The POST
+# is not idempotent (edges are CREATEd on every call), so read errors are not
+# retried, and neither is 500, which the API also returns for failures that
+# will never succeed. Once retries are exhausted the last response is returned
+# and handled by raise_for_status().
+_RETRY = Retry(
+    total=5,
+    read=False,
+    backoff_factor=0.5,
+    status_forcelist=[502, 503, 504],
+    allowed_methods=["POST"],
+    raise_on_status=False,
+)
+
+# Shared HTTP session so repeated calls reuse keep-alive connections to the API
+# instead of opening a new TCP connection per city.
+_ADAPTER = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=_RETRY)
+_SESSION = requests.Session()
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
 
 def add_city_to_graph_by_name(city_name: str, days: int = 7):
     """
@@ -100,7 +133,9 @@ def add_city_to_graph_by_coordinates(city_name: str, state: str, latitude: float
     logger.info(f"Creating graph nodes for {city_name}, {state}...")
 
     try:
-        response = requests.post(url, json=payload, timeout=60)
+        response = _SESSION.post(
+            url, json=payload, timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT)
+        )
         response.raise_for_status()
 
         data = response.json()
@@ -109,7 +144,6 @@ def add_city_to_graph_by_coordinates(city_name: str, state: str, latitude: float
         logger.info(f"  Distance to coast: {data['distance_to_coast_km']}km")
         logger.info(f"  Temperature nodes: {data['nodes_created']['temperature_nodes']}")
         logger.info(f"  Humidity nodes: {data['nodes_created']['humidity_nodes']}")
-        logger.info(f"  Precipitation nodes: {data['nodes_created']['precipitation_nodes']}")
         logger.info(f"  Total edges: {sum(data['edges_created'].values())}")
 
         return data
@@ -129,6 +163,39 @@ def add_city_to_graph_by_coordinates(city_name: str, state: str, latitude: float
         raise SystemExit(1) from error
 
 
+def add_cities_bulk(city_names: list[str], days: int = 7,
+                    max_workers: int = BULK_MAX_WORKERS) -> dict[str, dict | None]:
+    """
+    Add several cities to the graph concurrently.
+
+    Each city is resolved and posted to the API on its own worker thread, so
+    total wall time is roughly that of the slowest city rather than the sum of
+    all of them. A failure for one city is logged and does not abort the others.
+
+    Args:
+        city_names: City names to add (e.g., ["Denver", "San Diego, CA"])
+        days: Number of days of historical data (default: 7)
+        max_workers: Maximum number of cities processed at once
+
+    Returns:
+        dict: Mapping of city name to API response, or None if that city failed
+    """
+    def _add_one(city_name: str) -> dict | None:
+        try:
+            return add_city_to_graph_by_name(city_name, days)
+        except SystemExit:
+            # The single-city helpers exit on error; contain it to this city
+            logger.warning(f"Skipping {city_name}: graph nodes were not created")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = dict(zip(city_names, executor.map(_add_one, city_names)))
+
+    success_count = sum(1 for result in results.values() if result is not None)
+    logger.info(f"Added {success_count}/{len(city_names)} cities to the graph")
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Add a city to the weather graph",
@@ -140,6 +207,9 @@ Examples:
   python -m app.add_city_to_graph "San Diego, CA"
   python -m app.add_city_to_graph "Seattle" --days 14
 
+  # Adding several cities at once:
+  python -m app.add_city_to_graph "Denver" "Seattle" "Boston, MA"
+
   # Using explicit coordinates:
   python -m app.add_city_to_graph --lat 39.7392 --lon -104.9903 --city "Denver" --state "CO"
   python -m app.add_city_to_graph --lat 47.6062 --lon -122.3321 --city "Seattle" --state "WA" --days 14
@@ -149,7 +219,7 @@ Note:
         """
     )
 
-    parser.add_argument("city_name", type=str, nargs='?', help="Name of the city (e.g., 'Denver', 'San Diego, CA')")
+    parser.add_argument("city_names", type=str, nargs='*', help="Name(s) of the city (e.g., 'Denver', 'San Diego, CA')")
     parser.add_argument("--lat", "--latitude", type=float, dest="latitude", help="Latitude coordinate (requires --lon, --city, --state)")
     parser.add_argument("--lon", "--longitude", type=float, dest="longitude", help="Longitude coordinate (requires --lat, --city, --state)")
     parser.add_argument("--city", type=str, help="City name (used with --lat/--lon)")
@@ -182,12 +252,17 @@ Note:
         )
     else:
         # Name-based mode (geocoding)
-        if not args.city_name:
+        if not args.city_names:
             logger.error("✗ City name is required (or use --lat/--lon with --city/--state)")
             parser.print_help()
             sys.exit(1)
 
-        add_city_to_graph_by_name(args.city_name, args.days)
+        if len(args.city_names) == 1:
+            add_city_to_graph_by_name(args.city_names[0], args.days)
+        else:
+            results = add_cities_bulk(args.city_names, args.days)
+            if not any(results.values()):
+                sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -2,20 +2,48 @@
 Shared utilities for Apache AGE graph operations.
 
 This module provides:
-- Database connection management
+- Database connection management (pooled)
 - AGE extension setup helpers
 - Weather data categorization functions
+- Parameterized Cypher execution
 """
 
+import atexit
+import threading
+from bisect import bisect_right
 from contextlib import contextmanager
 from datetime import datetime
 
-from .config import get_postgres_connection, get_logger
+import orjson
+from psycopg import errors as pg_errors
+from psycopg_pool import ConnectionPool
+
+from .config import get_postgres_connection, get_postgres_params, get_logger
 
 logger = get_logger(__name__)
 
 GRAPH_NAME = "weather_graph"
 
+# Labels used by the weather graph (see ensure_graph_labels)
+GRAPH_VERTEX_LABELS = ("Location", "Temperature", "Humidity")
+GRAPH_EDGE_LABELS = ("CONCURRENT_WITH",)
+
+# Errors AGE raises when a label already exists (or is being created by a
+# concurrent transaction)
+_LABEL_EXISTS_ERRORS = (
+    pg_errors.DuplicateSchema,
+    pg_errors.DuplicateObject,
+    pg_errors.DuplicateTable,
+    pg_errors.UniqueViolation,
+)
+
+# Connection pool bounds (bulk graph creation uses up to 4 worker threads)
+AGE_POOL_MIN_SIZE = 1
+AGE_POOL_MAX_SIZE = 4
+
+_pool = None
+_pool_lock = threading.Lock()
+
 # ==============================================================
 # CONSTANTS
 # ==============================================================
@@ -47,6 +75,13 @@ HUMIDITY_HIGH_THRESHOLD = 70
 HUMIDITY_VERY_HIGH_THRESHOLD = 85
 HUMIDITY_PLEASANT_MAX = 55
 
+# Category boundaries (each is the lower bound of the next category) and labels.
+# Used with bisect_right, so a value equal to a boundary falls in the upper category.
+TEMP_CATEGORY_BOUNDS = (32, 50, 70, 85)
+TEMP_CATEGORY_LABELS = ("freezing", "cold", "mild", "warm", "hot")
+HUMIDITY_CATEGORY_BOUNDS = (30, 50, 70)
+HUMIDITY_CATEGORY_LABELS = ("dry", "comfortable", "humid", "very_humid")
+
 
 
 def get_age_connection():
@@ -59,19 +94,53 @@ def get_age_connection():
     return get_postgres_connection()
 
 
+def _configure_pooled_connection(conn):
+    """Load AGE once per pooled connection and leave it idle for the pool."""
+    setup_age_connection(conn)
+    conn.commit()
+
+
+def get_age_pool() -> ConnectionPool:
+    """
+    Get the shared AGE connection pool, creating it on first use.
+
+    Pooled connections run LOAD 'age' and set the search path once, when the
+    pool opens them, so borrowing a connection costs no extra round-trips.
+
+    Returns:
+        psycopg_pool.ConnectionPool: Process-wide connection pool
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    kwargs=get_postgres_params(),
+                    min_size=AGE_POOL_MIN_SIZE,
+                    max_size=AGE_POOL_MAX_SIZE,
+                    configure=_configure_pooled_connection,
+                    name="age",
+                    open=True,
+                )
+                atexit.register(_pool.close)
+    return _pool
+
+
 @contextmanager
 def age_cursor(conn=None):
     """
     Context manager for AGE operations with automatic setup.
 
     Handles:
-    - Connection creation (if not provided)
-    - AGE extension loading
-    - Search path configuration
+    - Borrowing a pooled connection (if not provided)
+    - AGE extension loading and search path configuration
     - Cursor management
 
+    A borrowed connection is returned to the pool on exit; any work not yet
+    committed is committed on success and rolled back on error.
+
     Args:
-        conn: Existing connection (optional). If None, creates new connection.
+        conn: Existing connection (optional). If None, borrows one from the pool.
 
     Yields:
         tuple: (cursor, connection)
@@ -81,20 +150,15 @@ def age_cursor(conn=None):
             cur.execute("SELECT * FROM cypher('weather_graph', $$...$$)")
             conn.commit()
     """
-    close_conn = False
-    if conn is None:
-        conn = get_age_connection()
-        close_conn = True
+    if conn is not None:
+        setup_age_connection(conn)
+        with conn.cursor() as cur:
+            yield cur, conn
+        return
 
-    try:
+    with get_age_pool().connection() as conn:
         with conn.cursor() as cur:
-            # Load AGE extension and set search path
-            cur.execute("LOAD 'age';")
-            cur.execute("SET search_path = ag_catalog, \"$user\", public;")
             yield cur, conn
-    finally:
-        if close_conn:
-            conn.close()
 
 
 def setup_age_connection(conn):
@@ -111,6 +175,49 @@ def setup_age_connection(conn):
         cur.execute("SET search_path = ag_catalog, \"$user\", public;")
 
 
+def ensure_graph_labels(cur=None):
+    """
+    Create any weather graph labels that don't exist yet.
+
+    AGE creates a label the first time a query uses it, and concurrent
+    transactions creating the same label fail with a unique violation. Call
+    this before writing to the graph from several threads at once.
+
+    Args:
+        cur: AGE cursor (optional). If given, the caller owns the transaction
+             and must commit; otherwise a connection is borrowed and committed.
+    """
+    if cur is None:
+        with age_cursor() as (cur, conn):
+            ensure_graph_labels(cur)
+            conn.commit()
+        return
+
+    cur.execute("""
+        SELECT l.name FROM ag_catalog.ag_label l
+        JOIN ag_catalog.ag_graph g ON l.graph = g.graphid
+        WHERE g.name = %s
+    """, (GRAPH_NAME,))
+    existing = {row[0] for row in cur.fetchall()}
+
+    for label in GRAPH_VERTEX_LABELS:
+        if label not in existing:
+            _create_label(cur, "create_vlabel", label)
+    for label in GRAPH_EDGE_LABELS:
+        if label not in existing:
+            _create_label(cur, "create_elabel", label)
+
+
+def _create_label(cur, function: str, label: str):
+    """Create a label, treating one created concurrently by another process as success."""
+    try:
+        # Savepoint, so a duplicate doesn't abort the caller's transaction
+        with cur.connection.transaction():
+            cur.execute(f"SELECT {function}(%s::cstring, %s::cstring)", (GRAPH_NAME, label))
+    except _LABEL_EXISTS_ERRORS:
+        logger.debug("Label %s already exists", label)
+
+
 # ==============================================================
 # WEATHER DATA CATEGORIZATION
 # ==============================================================
@@ -125,16 +232,7 @@ def categorize_temperature(temp_f: float) -> str:
     Returns:
         str: Category (freezing, cold, mild, warm, hot)
     """
-    if temp_f < 32:
-        return "freezing"
-    elif temp_f < 50:
-        return "cold"
-    elif temp_f < 70:
-        return "mild"
-    elif temp_f < 85:
-        return "warm"
-    else:
-        return "hot"
+    return TEMP_CATEGORY_LABELS[bisect_right(TEMP_CATEGORY_BOUNDS, temp_f)]
 
 
 def categorize_humidity(humidity: float) -> str:
@@ -147,16 +245,7 @@ def categorize_humidity(humidity: float) -> str:
     Returns:
         str: Comfort level (dry, comfortable, humid, very_humid)
     """
-    if humidity < 30:
-        return "dry"
-    elif humidity < 50:
-        return "comfortable"
-    elif humidity < 70:
-        return "humid"
-    else:
-        return "very_humid"
-
-
+    return HUMIDITY_CATEGORY_LABELS[bisect_right(HUMIDITY_CATEGORY_BOUNDS, humidity)]
 
 
 # ==============================================================
@@ -191,36 +280,63 @@ def format_timestamp(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%d %H:%M:%S")
 
 
-def create_weather_node(cur, node_type: str, timestamp: str, location: str,
-                       time_category: str, value_field: str, value: float,
-                       category_field: str, category: str):
+def execute_cypher(cur, query: str, params: dict, columns: str = "(result agtype)"):
+    """
+    Execute a parameterized Cypher query against the weather graph.
+
+    Values are passed to AGE as a single agtype map and referenced in the query
+    as ``$name``, so the query text stays constant and a whole batch of rows
+    can be sent in one round-trip (e.g., ``UNWIND $rows AS r CREATE ...``).
+    The map is serialized with orjson, which also accepts NumPy scalars.
+
+    Args:
+        cur: Database cursor
+        query: Cypher query body (without the surrounding cypher() call)
+        params: JSON-serializable parameter map
+        columns: Column definition list for the cypher() result
+
+    Example:
+        execute_cypher(cur, "UNWIND $names AS n MERGE (:Location {name: n})",
+                       {"names": ["Huntsville", "Mobile"]})
     """
-    Create a weather node (Temperature, Humidity, or Precipitation).
+    cur.execute(
+        f"SELECT * FROM cypher('{GRAPH_NAME}', $$ {query} $$, %s) as {columns}",
+        (orjson.dumps(params, option=orjson.OPT_SERIALIZE_NUMPY).decode(),),
+    )
+
+
+def create_weather_nodes(cur, node_type: str, value_field: str,
+                         category_field: str, rows: list[dict]) -> int:
+    """
+    Create or update a batch of weather nodes (Temperature, Humidity, or Precipitation).
+
+    All rows are sent in a single UNWIND statement. Nodes are merged on
+    (timestamp, location), so re-running an ingest updates existing readings
+    instead of duplicating them.
 
     Args:
         cur: Database cursor
         node_type: Node type (Temperature, Humidity, Precipitation)
-        timestamp: Timestamp string
-        location: Location name
-        time_category: Time of day category
         value_field: Name of value field (e.g., 'value_f', 'value_percent')
-        value: Numeric value
         category_field: Name of category field (e.g., 'heat_category', 'comfort_level')
-        category: Category string
-    """
-    cypher = f"""
-        SELECT * FROM cypher('{GRAPH_NAME}', $$
-            CREATE (n:{node_type} {{
-                timestamp: '{timestamp}',
-                {value_field}: {value},
-                location: '{location}',
-                time_of_day: '{time_category}',
-                {category_field}: '{category}'
-            }})
-            RETURN n
-        $$) as (n agtype)
+        rows: Dicts with keys timestamp, location, time_of_day, value, category
+
+    Returns:
+        int: Number of rows written
     """
-    cur.execute(cypher)
+    if not rows:
+        return 0
+
+    # Labels and property names can't be Cypher parameters; they come from the
+    # fixed set used by callers. All values are passed as parameters.
+    execute_cypher(cur, f"""
+        UNWIND $rows AS r
+        MERGE (n:{node_type} {{timestamp: r.timestamp, location: r.location}})
+        SET n.{value_field} = r.value,
+            n.time_of_day = r.time_of_day,
+            n.{category_field} = r.category
+    """, {"rows": rows}, columns="(n agtype)")
+    return len(rows)
 
 
 def create_concurrent_edges_between(cur, node_type1: str, node_type2: str,
@@ -237,16 +353,13 @@ def create_concurrent_edges_between(cur, node_type1: str, node_type2: str,
     Returns:
         int: Number of edges created (one direction)
     """
-    cypher = f"""
-        SELECT * FROM cypher('{GRAPH_NAME}', $$
-            MATCH (n1:{node_type1} {{location: '{location}'}}),
-                  (n2:{node_type2} {{location: '{location}'}})
-            WHERE n1.timestamp = n2.timestamp
-            CREATE (n1)-[r1:CONCURRENT_WITH]->(n2)
-            CREATE (n2)-[r2:CONCURRENT_WITH]->(n1)
-            RETURN count(r1) as edge_count
-        $$) as (edge_count agtype)
-    """
-    cur.execute(cypher)
+    execute_cypher(cur, f"""
+        MATCH (n1:{node_type1} {{location: $location}}),
+              (n2:{node_type2} {{location: $location}})
+        WHERE n1.timestamp = n2.timestamp
+        CREATE (n1)-[r1:CONCURRENT_WITH]->(n2)
+        CREATE (n2)-[r2:CONCURRENT_WITH]->(n1)
+        RETURN count(r1) as edge_count
+    """, {"location": location}, columns="(edge_count agtype)")
     result = cur.fetchone()
     return parse_agtype_count(result) if result else 0
@@ -10,10 +10,14 @@ Usage:
 """
 
 from datetime import date, timedelta
-from math import radians, sin, cos, sqrt, atan2
+from functools import lru_cache
+from math import radians, sin, cos, sqrt, asin
+
+import numpy as np
+import orjson
 
 from .config import get_logger
-from .age_utils import age_cursor, GRAPH_NAME
+from .age_utils import age_cursor, execute_cypher, GRAPH_NAME
 
 logger = get_logger(__name__)
 
@@ -23,6 +27,46 @@ NEAR_DISTANCE_THRESHOLD_KM = 300
 # Default number of days for sample weather data
 DEFAULT_HISTORICAL_DAYS = 7
 
+# Earth's mean radius in kilometers
+EARTH_RADIUS_KM = 6371
+
+# Reference points along major US coastlines
+# These coordinates are sampled at regular intervals to approximate coastlines
+# More points = better accuracy but slower computation
+COASTAL_REFERENCES = [
+    # Atlantic Coast (north to south)
+    (44.3106, -68.7781),  # Maine
+    (42.3601, -71.0589),  # Boston
+    (40.7128, -74.0060),  # New York
+    (38.9072, -77.0369),  # DC area
+    (36.8529, -75.9780),  # Virginia Beach
+    (33.9191, -78.9487),  # Myrtle Beach
+    (32.0809, -80.9009),  # Charleston SC coast
+    (31.5383, -81.3912),  # Savannah coast
+    (30.3322, -81.6557),  # Jacksonville coast
+    (25.7617, -80.1918),  # Miami
+
+    # Gulf Coast (east to west)
+    (30.3960, -86.4735),  # Destin FL
+    (30.6944, -88.0431),  # Mobile Bay
+    (29.3013, -89.4250),  # New Orleans coast
+    (29.7604, -95.3698),  # Houston/Galveston
+    (27.8006, -97.3964),  # Corpus Christi
+
+    # Pacific Coast (south to north)
+    (32.7157, -117.1611), # San Diego
+    (33.7701, -118.1937), # Los Angeles coast
+    (37.7749, -122.4194), # San Francisco
+    (45.5152, -122.6784), # Portland area
+    (47.6062, -122.3321), # Seattle
+]
+
+# Coastal reference coordinates in radians (and the cosine of each latitude),
+# computed once at import time rather than on every distance calculation
+_COAST_LATS_RAD = np.radians([coast_lat for coast_lat, _ in COASTAL_REFERENCES])
+_COAST_LONS_RAD = np.radians([coast_lon for _, coast_lon in COASTAL_REFERENCES])
+_COAST_COS_LATS = np.cos(_COAST_LATS_RAD)
+
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -38,7 +82,7 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Returns:
         float: Distance in kilometers
     """
-    R = 6371  # Earth's mean radius in kilometers
+    R = EARTH_RADIUS_KM
 
     # Convert decimal degrees to radians for trigonometric functions
     lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
@@ -47,57 +91,87 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
 
     # Haversine formula: a = sin²(Δlat/2) + cos(lat1) × cos(lat2) × sin²(Δlon/2)
     a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    # c = 2 × atan2(√a, √(1−a)) gives the angular distance in radians
-    c = 2 * atan2(sqrt(a), sqrt(1-a))
+    # c = 2 × asin(√a) gives the angular distance in radians
+    # (equivalent to 2 × atan2(√a, √(1−a)) but needs one square root instead of two)
+    c = 2 * asin(min(1.0, sqrt(a)))
 
     return R * c
 
 
+def pairwise_distances(lats, lons) -> np.ndarray:
+    """
+    Calculate the great-circle distance between every pair of coordinates.
+
+    Vectorized Haversine formula: all N x N distances are computed with NumPy
+    broadcasting in one pass instead of a nested Python loop.
+
+    Args:
+        lats: Sequence of latitudes (degrees)
+        lons: Sequence of longitudes (degrees), same length as lats
+
+    Returns:
+        np.ndarray: Symmetric N x N matrix of distances in kilometers
+    """
+    lats_r = np.radians(np.asarray(lats, dtype=float))
+    lons_r = np.radians(np.asarray(lons, dtype=float))
+
+    dlat = lats_r[:, None] - lats_r[None, :]
+    dlon = lons_r[:, None] - lons_r[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lats_r)[:, None] * np.cos(lats_r)[None, :] * np.sin(dlon / 2) ** 2
+
+    # Clamp as in haversine_distance: rounding can push a just past 1
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+@lru_cache(maxsize=4096)
+def _distance_to_coast(lat: float, lon: float) -> float:
+    """Compute the distance to coast for already-rounded coordinates (cached)."""
+    # Only the input point needs converting; reference points are precomputed
+    lat_r = np.radians(lat)
+    lon_r = np.radians(lon)
+
+    dlat = _COAST_LATS_RAD - lat_r
+    dlon = _COAST_LONS_RAD - lon_r
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat_r) * _COAST_COS_LATS * np.sin(dlon / 2) ** 2
+    distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    # Minimum distance to any coastal reference point
+    return round(float(distances.min()), 1)
+
+
 def calculate_distance_to_coast(lat: float, lon: float) -> float:
     """
     Calculate minimum distance from coordinates to nearest US coastline.
 
     Uses reference points along Atlantic, Gulf, and Pacific coasts.
     Works for any US city coordinates provided by user.
+
+    The Haversine distance to every reference point is evaluated in a single
+    vectorized NumPy expression rather than a Python loop. Results are cached
+    by coordinates rounded to 3 decimal places (~100 m), well below the 0.1 km
+    precision of the result.
     """
-    # Reference points along major US coastlines
-    # These coordinates are sampled at regular intervals to approximate coastlines
-    # More points = better accuracy but slower computation
-    coastal_references = [
-        # Atlantic Coast (north to south)
-        (44.3106, -68.7781),  # Maine
-        (42.3601, -71.0589),  # Boston
-        (40.7128, -74.0060),  # New York
-        (38.9072, -77.0369),  # DC area
-        (36.8529, -75.9780),  # Virginia Beach
-        (33.9191, -78.9487),  # Myrtle Beach
-        (32.0809, -80.9009),  # Charleston SC coast
-        (31.5383, -81.3912),  # Savannah coast
-        (30.3322, -81.6557),  # Jacksonville coast
-        (25.7617, -80.1918),  # Miami
-
-        # Gulf Coast (east to west)
-        (30.3960, -86.4735),  # Destin FL
-        (30.6944, -88.0431),  # Mobile Bay
-        (29.3013, -89.4250),  # New Orleans coast
-        (29.7604, -95.3698),  # Houston/Galveston
-        (27.8006, -97.3964),  # Corpus Christi
-
-        # Pacific Coast (south to north)
-        (32.7157, -117.1611), # San Diego
-        (33.7701, -118.1937), # Los Angeles coast
-        (37.7749, -122.4194), # San Francisco
-        (45.5152, -122.6784), # Portland area
-        (47.6062, -122.3321), # Seattle
-    ]
+    return _distance_to_coast(round(lat, 3), round(lon, 3))
 
-    # Find minimum distance to any coastal reference point
-    min_distance = float('inf')
-    for coast_lat, coast_lon in coastal_references:
-        distance = haversine_distance(lat, lon, coast_lat, coast_lon)
-        min_distance = min(min_distance, distance)
 
-    return round(min_distance, 1)
+def _existing_near_pairs(cur) -> set[tuple[str, str]]:
+    """
+    Get the NEAR edges already present in the graph.
+
+    Args:
+        cur: Database cursor
+
+    Returns:
+        set: (from_location_name, to_location_name) tuples
+    """
+    cur.execute(f"""
+        SELECT * FROM cypher('{GRAPH_NAME}', $$
+            MATCH (a:Location)-[:NEAR]->(b:Location)
+            RETURN a.name, b.name
+        $$) as (a agtype, b agtype)
+    """)
+    # agtype strings come back JSON-encoded (e.g., '"Huntsville"')
+    return {(orjson.loads(a), orjson.loads(b)) for a, b in cur.fetchall()}
 
 
 def setup_graph():
@@ -111,6 +185,9 @@ def setup_graph():
     - HAS_WEATHER edges connecting locations to their weather readings
     - NEXT_DAY edges linking consecutive weather readings
 
+    Each phase is sent as a single batched (UNWIND) Cypher query, so the number
+    of database round-trips does not grow with the number of locations or days.
+
     This function is idempotent - MERGE ensures nodes aren't duplicated.
     """
     logger.info("Setting up graph with sample data...")
@@ -132,56 +209,69 @@ def setup_graph():
     ]
 
     with age_cursor() as (cur, conn):
-        # Create Location nodes
+        # Create Location nodes (one batched query for all locations)
         logger.info("Creating Location nodes...")
+        location_rows = []
         for loc in locations:
             # Calculate distance to coast dynamically for any coordinates
             distance_to_coast = calculate_distance_to_coast(loc["lat"], loc["lon"])
-
-            cypher = f"""
-                SELECT * FROM cypher('{GRAPH_NAME}', $$
-                    MERGE (l:Location {{name: '{loc["name"]}', state: '{loc["state"]}'}})
-                    SET l.latitude = {loc["lat"]},
-                        l.longitude = {loc["lon"]},
-                        l.distance_to_coast_km = {distance_to_coast}
-                    RETURN l
-                $$) as (l agtype)
-            """
-            cur.execute(cypher)
+            location_rows.append({
+                "name": loc["name"],
+                "state": loc["state"],
+                "lat": loc["lat"],
+                "lon": loc["lon"],
+                "distance_to_coast_km": distance_to_coast,
+            })
             logger.info(f"  {loc['name']}: {distance_to_coast}km from coast")
 
-        conn.commit()
+        execute_cypher(cur, """
+            UNWIND $locations AS loc
+            MERGE (l:Location {name: loc.name, state: loc.state})
+            SET l.latitude = loc.lat,
+                l.longitude = loc.lon,
+                l.distance_to_coast_km = loc.distance_to_coast_km
+            RETURN count(l)
+        """, {"locations": location_rows})
+
         logger.info(f"Created {len(locations)} Location nodes")
 
         # Create NEAR relationships between nearby cities (within 300km)
         logger.info("Creating NEAR relationships...")
-        near_count = 0
-        for i, loc1 in enumerate(locations):
-            for loc2 in locations[i+1:]:
-                distance = haversine_distance(
-                    loc1["lat"], loc1["lon"],
-                    loc2["lat"], loc2["lon"]
-                )
-                if distance <= NEAR_DISTANCE_THRESHOLD_KM:
-                    cypher = f"""
-                        SELECT * FROM cypher('{GRAPH_NAME}', $$
-                            MATCH (a:Location {{name: '{loc1["name"]}'}}),
-                                  (b:Location {{name: '{loc2["name"]}'}})
-                            MERGE (a)-[r:NEAR {{distance_km: {distance:.1f}}}]->(b)
-                            MERGE (b)-[r2:NEAR {{distance_km: {distance:.1f}}}]->(a)
-                            RETURN r
-                        $$) as (r agtype)
-                    """
-                    cur.execute(cypher)
-                    near_count += 1
-
-        conn.commit()
-        logger.info(f"Created {near_count} NEAR relationships")
+        distances = pairwise_distances(
+            [loc["lat"] for loc in locations],
+            [loc["lon"] for loc in locations],
+        )
+        # Upper triangle only (k=1) so each pair is visited once, excluding self-pairs
+        near_mask = np.triu(distances <= NEAR_DISTANCE_THRESHOLD_KM, k=1)
+        # Skip pairs already linked on a previous run, so plain CREATE (one
+        # write per edge, no MERGE lookup) keeps the function idempotent
+        existing_pairs = _existing_near_pairs(cur)
+        near_pairs = [
+            {
+                "a": locations[i]["name"],
+                "b": locations[j]["name"],
+                "distance_km": round(float(distances[i, j]), 1),
+            }
+            for i, j in np.argwhere(near_mask)
+            if (locations[i]["name"], locations[j]["name"]) not in existing_pairs
+        ]
+
+        if near_pairs:
+            execute_cypher(cur, """
+                UNWIND $pairs AS p
+                MATCH (a:Location {name: p.a}), (b:Location {name: p.b})
+                CREATE (a)-[:NEAR {distance_km: p.distance_km}]->(b)
+                CREATE (b)-[:NEAR {distance_km: p.distance_km}]->(a)
+                RETURN count(*)
+            """, {"pairs": near_pairs})
+
+        logger.info(f"Created {len(near_pairs)} NEAR relationships")
 
         # Create sample WeatherReading nodes and HAS_WEATHER edges
         logger.info("Creating WeatherReading nodes and HAS_WEATHER edges...")
-        weather_count = 0
         base_date = date.today()
+        readings = []
+        next_day_links = []
 
         for loc in locations:
             # Create weather data for each location
@@ -193,44 +283,51 @@ def setup_graph():
                 high_temp = base_high + (day_offset % 3) * 2
                 low_temp = base_low + (day_offset % 3)
 
-                cypher = f"""
-                    SELECT * FROM cypher('{GRAPH_NAME}', $$
-                        MATCH (l:Location {{name: '{loc["name"]}'}})
-                        CREATE (w:WeatherReading {{
-                            date: '{d.isoformat()}',
-                            high_temp_f: {high_temp:.1f},
-                            low_temp_f: {low_temp:.1f}
-                        }})
-                        CREATE (l)-[:HAS_WEATHER]->(w)
-                        RETURN w
-                    $$) as (w agtype)
-                """
-                cur.execute(cypher)
-                weather_count += 1
-
-        conn.commit()
-        logger.info(f"Created {weather_count} WeatherReading nodes with HAS_WEATHER edges")
+                readings.append({
+                    "name": loc["name"],
+                    "date": d.isoformat(),
+                    "high_temp_f": round(high_temp, 1),
+                    "low_temp_f": round(low_temp, 1),
+                })
+
+                # Link each reading to the following day's reading
+                if day_offset < DEFAULT_HISTORICAL_DAYS - 1:
+                    next_day_links.append({
+                        "name": loc["name"],
+                        "d1": d.isoformat(),
+                        "d2": (d + timedelta(days=1)).isoformat(),
+                    })
+
+        execute_cypher(cur, """
+            UNWIND $readings AS r
+            MATCH (l:Location {name: r.name})
+            CREATE (w:WeatherReading {
+                date: r.date,
+                high_temp_f: r.high_temp_f,
+                low_temp_f: r.low_temp_f
+            })
+            CREATE (l)-[:HAS_WEATHER]->(w)
+            RETURN count(w)
+        """, {"readings": readings})
+
+        logger.info(f"Created {len(readings)} WeatherReading nodes with HAS_WEATHER edges")
 
         # Create NEXT_DAY relationships between consecutive weather readings
         logger.info("Creating NEXT_DAY relationships...")
-        for loc in locations:
-            for day_offset in range(DEFAULT_HISTORICAL_DAYS - 1):
-                d1 = (base_date + timedelta(days=day_offset)).isoformat()
-                d2 = (base_date + timedelta(days=day_offset + 1)).isoformat()
-
-                cypher = f"""
-                    SELECT * FROM cypher('{GRAPH_NAME}', $$
-                        MATCH (l:Location {{name: '{loc["name"]}'}})-[:HAS_WEATHER]->(w1:WeatherReading {{date: '{d1}'}}),
-                              (l)-[:HAS_WEATHER]->(w2:WeatherReading {{date: '{d2}'}})
-                        MERGE (w1)-[:NEXT_DAY]->(w2)
-                        RETURN w1, w2
-                    $$) as (w1 agtype, w2 agtype)
-                """
-                cur.execute(cypher)
+        execute_cypher(cur, """
+            UNWIND $links AS k
+            MATCH (l:Location {name: k.name})-[:HAS_WEATHER]->(w1:WeatherReading {date: k.d1}),
+                  (l)-[:HAS_WEATHER]->(w2:WeatherReading {date: k.d2})
+            MERGE (w1)-[:NEXT_DAY]->(w2)
+            RETURN count(*)
+        """, {"links": next_day_links})
 
-        conn.commit()
         logger.info("Created NEXT_DAY relationships")
 
+        # Commit all phases together: one WAL flush, and a failure part-way
+        # through leaves the graph untouched rather than half-built.
+        conn.commit()
+
     logger.info("Graph setup complete!")
 
 
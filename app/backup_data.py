@@ -25,13 +25,19 @@ Configuration (via environment variables):
     BACKUP_RETENTION_DAYS: Days to keep old backups (default: 14)
 """
 
-import json
 import hashlib
+import mmap
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from fnmatch import fnmatch
 from pathlib import Path
 
+import orjson
 from psycopg import sql
 import pyarrow as pa
+import pyarrow.csv as pacsv
 import pyarrow.parquet as pq
 
 from .config import (
@@ -43,6 +49,23 @@ logger = get_logger(__name__)
 # Columns to export (excluding auto-increment id) - must match WeatherData model
 BACKUP_COLUMNS = ["date", "location_name", "latitude", "longitude", "high_temp_f", "low_temp_f"]
 
+# Explicit Arrow schema for the backup file (column order matches BACKUP_COLUMNS).
+# Coordinates stay float64 so restored rows match the original lookup keys exactly.
+BACKUP_SCHEMA = pa.schema([
+    ("date", pa.date32()),
+    ("location_name", pa.string()),
+    ("latitude", pa.float64()),
+    ("longitude", pa.float64()),
+    ("high_temp_f", pa.float64()),
+    ("low_temp_f", pa.float64()),
+])
+
+# Bytes of CSV parsed by Arrow per record batch (one Parquet row group each)
+BACKUP_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Maximum number of threads used to delete expired backups
+RETENTION_MAX_WORKERS = 8
+
 
 def _now_utc():
     """Get current UTC timestamp."""
@@ -66,20 +89,50 @@ def _write_sha256(path: Path):
     Returns:
         Path: Path to the created checksum file
     """
-    h = hashlib.sha256()
     with open(path, "rb") as f:
-        # Read in 1MB chunks to handle large files efficiently
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: hashing loop runs in C and releases the GIL
+            h = hashlib.file_digest(f, "sha256")
+        else:
+            # Older Pythons: hash the memory-mapped file in a single update() call
+            h = hashlib.sha256()
+            if os.fstat(f.fileno()).st_size > 0:  # mmap can't map empty files
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    h.update(mm)
     sha_path = path.with_suffix(path.suffix + ".sha256")
     sha_path.write_text(h.hexdigest() + "  " + path.name + "\n", encoding="utf-8")
     return sha_path
 
 
+def _delete_backup(path: Path):
+    """
+    Delete a backup file and its associated checksum file.
+
+    Args:
+        path: Path to the backup file
+
+    Returns:
+        Path | None: The deleted backup path, or None if deletion failed
+    """
+    try:
+        path.unlink(missing_ok=True)
+        # Also delete associated checksum file
+        Path(f"{path}.sha256").unlink(missing_ok=True)
+        logger.debug(f"Deleted old backup: {path}")
+        return path
+    except OSError as e:
+        logger.warning(f"Failed to delete backup file {path}: {e}")
+        return None
+
+
 def _apply_retention(folder: Path, pattern: str, keep_days: int):
     """
     Delete backup files older than retention period.
 
+    The directory is read in a single os.scandir() pass. Only entries that
+    match the pattern are stat()ed (one stat call each on Linux), and stale
+    files are deleted in parallel.
+
     Args:
         folder: Directory containing backups
         pattern: Glob pattern to match backup files
@@ -90,22 +143,17 @@ def _apply_retention(folder: Path, pattern: str, keep_days: int):
     """
     if keep_days <= 0:
         return []
-    cutoff = _now_utc() - timedelta(days=keep_days)
-    deleted = []
-    for fp in folder.glob(pattern):
-        ts = datetime.fromtimestamp(fp.stat().st_mtime, tz=timezone.utc)
-        if ts < cutoff:
-            try:
-                fp.unlink(missing_ok=True)
-                # Also delete associated checksum file
-                sha = fp.with_suffix(fp.suffix + ".sha256")
-                if sha.exists():
-                    sha.unlink(missing_ok=True)
-                deleted.append(fp)
-                logger.debug(f"Deleted old backup: {fp}")
-            except OSError as e:
-                logger.warning(f"Failed to delete backup file {fp}: {e}")
-    return deleted
+    # Compare raw mtimes against an epoch cutoff (no per-file datetime objects)
+    cutoff_epoch = (_now_utc() - timedelta(days=keep_days)).timestamp()
+    with os.scandir(folder) as entries:
+        stale = [
+            Path(entry.path) for entry in entries
+            if fnmatch(entry.name, pattern) and entry.stat().st_mtime < cutoff_epoch
+        ]
+    if not stale:
+        return []
+    with ThreadPoolExecutor(max_workers=RETENTION_MAX_WORKERS) as executor:
+        return [path for path in executor.map(_delete_backup, stale) if path is not None]
 
 
 def backup_postgres():
@@ -115,6 +163,9 @@ def backup_postgres():
     Creates a timestamped backup file with ZSTD compression and generates
     a SHA256 checksum. Applies retention policy to delete old backups.
 
+    Rows are exported with COPY and parsed by Arrow in blocks of
+    BACKUP_BLOCK_SIZE bytes, so memory use stays flat regardless of table size.
+
     Returns:
         tuple: (parquet_file_path, sha256_file_path)
 
@@ -130,29 +181,44 @@ def backup_postgres():
 
     logger.info(f"Starting PostgreSQL backup to {out_path}")
 
-    with get_postgres_connection() as conn:
-        with conn.cursor() as cur:
-            # Use sql.Identifier for safe table name handling
-            col_list = sql.SQL(", ").join([sql.Identifier(c) for c in BACKUP_COLUMNS])
-            query = sql.SQL("""
-                SELECT {}
-                FROM {}
-                ORDER BY date ASC, location_name ASC
-            """).format(col_list, sql.Identifier(WEATHER_TABLE))
-            cur.execute(query)
-            rows = cur.fetchall()
-
-    # Build Arrow table -> Parquet
-    if rows:
-        data = {col: values for col, values in zip(BACKUP_COLUMNS, zip(*rows))}
-        table_pa = pa.table(data)
-    else:
-        table_pa = pa.table({c: pa.array([], type=pa.null()) for c in BACKUP_COLUMNS})
-
-    pq.write_table(table_pa, out_path, compression="zstd", use_dictionary=True)
+    # Export -> Arrow without building Python row objects: Postgres streams the
+    # table as CSV (spooled to a temp file), and Arrow's C parser converts it
+    # straight into typed columnar record batches.
+    with tempfile.TemporaryFile() as spool:
+        with get_postgres_connection() as conn:
+            with conn.cursor() as cur:
+                # Use sql.Identifier for safe table name handling
+                col_list = sql.SQL(", ").join([sql.Identifier(c) for c in BACKUP_COLUMNS])
+                query = sql.SQL("""
+                    COPY (
+                        SELECT {}
+                        FROM {}
+                        ORDER BY date ASC, location_name ASC
+                    ) TO STDOUT (FORMAT CSV)
+                """).format(col_list, sql.Identifier(WEATHER_TABLE))
+                with cur.copy(query) as copy:
+                    for chunk in copy:
+                        spool.write(chunk)
+
+        row_count = 0
+        with pq.ParquetWriter(out_path, BACKUP_SCHEMA, compression="zstd",
+                              use_dictionary=True) as writer:
+            # An empty table produces no CSV at all; write a schema-only file
+            if spool.tell() > 0:
+                spool.seek(0)
+                reader = pacsv.open_csv(
+                    spool,
+                    read_options=pacsv.ReadOptions(column_names=BACKUP_COLUMNS,
+                                                   block_size=BACKUP_BLOCK_SIZE),
+                    convert_options=pacsv.ConvertOptions(column_types=BACKUP_SCHEMA),
+                )
+                for batch in reader:
+                    writer.write_batch(batch)
+                    row_count += batch.num_rows
+
     sha = _write_sha256(out_path)
 
-    logger.info(f"Backup completed: {len(rows)} rows written")
+    logger.info(f"Backup completed: {row_count} rows written")
 
     # Retention
     deleted = _apply_retention(BACKUP_DIR, "postgres_*.parquet", BACKUP_RETENTION_DAYS)
@@ -164,4 +230,4 @@ def backup_postgres():
 
 if __name__ == "__main__":
     out_path, sha_path = backup_postgres()
-    print(json.dumps({"file": out_path, "sha256": sha_path}, indent=2))
+    print(orjson.dumps({"file": out_path, "sha256": sha_path}, option=orjson.OPT_INDENT_2).decode())
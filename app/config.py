@@ -29,30 +29,30 @@ def get_logger(name: str) -> logging.Logger:
 
 def _validate_port(value: str, name: str) -> int:
     """Validate and convert a port number."""
-    try:
-        port = int(value)
-        if not (1 <= port <= 65535):
-            raise ValueError(f"{name} must be between 1 and 65535, got {port}")
-        return port
-    except ValueError as e:
-        raise ValueError(f"Invalid {name}: {e}")
+    digits = value.strip()
+    if not (digits.isascii() and digits.isdigit()):
+        raise ValueError(f"Invalid {name}: expected a port number, got {value!r}")
+    port = int(value)
+    if not (1 <= port <= 65535):
+        raise ValueError(f"Invalid {name}: must be between 1 and 65535, got {port}")
+    return port
 
 def _validate_positive_int(value: str, name: str) -> int:
     """Validate and convert a positive integer."""
-    try:
-        num = int(value)
-        if num < 0:
-            raise ValueError(f"{name} must be non-negative, got {num}")
-        return num
-    except ValueError as e:
-        raise ValueError(f"Invalid {name}: {e}")
+    digits = value.strip().removeprefix("-")
+    if not (digits.isascii() and digits.isdigit()):
+        raise ValueError(f"Invalid {name}: expected an integer, got {value!r}")
+    num = int(value)
+    if num < 0:
+        raise ValueError(f"Invalid {name}: must be non-negative, got {num}")
+    return num
 
 def _validate_float(value: str, name: str) -> float:
     """Validate and convert a float."""
     try:
         return float(value)
     except ValueError as e:
-        raise ValueError(f"Invalid {name}: {e}")
+        raise ValueError(f"Invalid {name}: {e}") from e
 
 # ==============================================================
 # DATABASE CONFIGURATION
@@ -71,9 +71,19 @@ DATABASE_URL = os.getenv(
     f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 )
 
+# SQLAlchemy connection pool size for the API. The default follows the common
+# (cores * 2) + 1 rule of thumb; larger pools mostly add contention in Postgres.
+DB_POOL_SIZE = _validate_positive_int(
+    os.getenv("DB_POOL_SIZE", str((os.cpu_count() or 1) * 2 + 1)), "DB_POOL_SIZE"
+)
+
 # Table name for weather data
 WEATHER_TABLE = os.getenv("WEATHER_TABLE", "weather_data")
 
+# Create tables on every API startup. When off, tables are created once per
+# schema version per container (see main.lifespan).
+RUN_MIGRATIONS = os.getenv("RUN_MIGRATIONS", "0") == "1"
+
 # ==============================================================
 # LOCATION DEFAULTS
 # ==============================================================
@@ -89,6 +99,16 @@ DEFAULT_TIMEZONE = os.getenv("DEFAULT_TIMEZONE", "America/Chicago")
 BACKUP_DIR = Path(os.getenv("BACKUP_DIR", "/backups")).expanduser()
 BACKUP_RETENTION_DAYS = _validate_positive_int(os.getenv("BACKUP_RETENTION_DAYS", "14"), "BACKUP_RETENTION_DAYS")
 
+# ==============================================================
+# CACHE CONFIGURATION
+# ==============================================================
+
+# Directory for persistent lookup caches (e.g., geocoding results)
+CACHE_DIR = Path(os.getenv("CACHE_DIR", str(BACKUP_DIR / "cache"))).expanduser()
+
+# Days before a cached geocoding result is looked up again
+GEOCODE_CACHE_TTL_DAYS = _validate_positive_int(os.getenv("GEOCODE_CACHE_TTL_DAYS", "30"), "GEOCODE_CACHE_TTL_DAYS")
+
 # ==============================================================
 # API CONFIGURATION
 # ==============================================================
@@ -97,21 +117,27 @@ USER_AGENT = os.getenv("USER_AGENT", "weather_api (github.com/austindatascientis
 API_TIMEOUT = _validate_positive_int(os.getenv("API_TIMEOUT", "10"), "API_TIMEOUT")
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
 
+# Timeouts for calls to this project's own API (seconds). The connect timeout is
+# kept short so a dead endpoint is detected quickly; it sits slightly above 3s,
+# the default TCP retransmission window. The read timeout stays long because
+# graph creation can take a while for large datasets.
+API_CONNECT_TIMEOUT = _validate_float(os.getenv("API_CONNECT_TIMEOUT", "3.05"), "API_CONNECT_TIMEOUT")
+API_READ_TIMEOUT = _validate_float(os.getenv("API_READ_TIMEOUT", "60"), "API_READ_TIMEOUT")
+
 # ==============================================================
 # UTILITY FUNCTIONS
 # ==============================================================
 
-def get_postgres_connection(**overrides):
+def get_postgres_params(**overrides) -> dict:
     """
-    Get an authenticated PostgreSQL connection using psycopg.
+    Get PostgreSQL connection parameters.
 
     Args:
         **overrides: Keyword arguments to replace default connection values.
                      Options: host, port, dbname, user, password
-                     Example: get_postgres_connection(dbname='test_db')
 
     Returns:
-        psycopg.Connection: A PostgreSQL connection
+        dict: Keyword arguments for psycopg.connect()
     """
     params = {
         'host': POSTGRES_HOST,
@@ -121,4 +147,19 @@ def get_postgres_connection(**overrides):
         'password': POSTGRES_PASSWORD,
     }
     params.update(overrides)
-    return psycopg.connect(**params)
+    return params
+
+
+def get_postgres_connection(**overrides):
+    """
+    Get an authenticated PostgreSQL connection using psycopg.
+
+    Args:
+        **overrides: Keyword arguments to replace default connection values.
+                     Options: host, port, dbname, user, password
+                     Example: get_postgres_connection(dbname='test_db')
+
+    Returns:
+        psycopg.Connection: A PostgreSQL connection
+    """
+    return psycopg.connect(**get_postgres_params(**overrides))
@@ -18,33 +18,36 @@ Usage:
     python -m app.create_node_relationships
 """
 
-import json
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+import orjson
 import requests
 
-from .config import get_logger
+from .age_utils import ensure_graph_labels
+from .config import CACHE_DIR, get_logger
 from .graph_nodes import create_city_graph
+from .json_cache import JsonFileCache
+from .state_codes import STATE_ABBREV
 
 logger = get_logger(__name__)
 
-# State name to abbreviation mapping
-STATE_ABBREV = {
-    "Alabama": "AL", "Alaska": "AK", "Arizona": "AZ", "Arkansas": "AR",
-    "California": "CA", "Colorado": "CO", "Connecticut": "CT", "Delaware": "DE",
-    "Florida": "FL", "Georgia": "GA", "Hawaii": "HI", "Idaho": "ID",
-    "Illinois": "IL", "Indiana": "IN", "Iowa": "IA", "Kansas": "KS",
-    "Kentucky": "KY", "Louisiana": "LA", "Maine": "ME", "Maryland": "MD",
-    "Massachusetts": "MA", "Michigan": "MI", "Minnesota": "MN", "Mississippi": "MS",
-    "Missouri": "MO", "Montana": "MT", "Nebraska": "NE", "Nevada": "NV",
-    "New Hampshire": "NH", "New Jersey": "NJ", "New Mexico": "NM", "New York": "NY",
-    "North Carolina": "NC", "North Dakota": "ND", "Ohio": "OH", "Oklahoma": "OK",
-    "Oregon": "OR", "Pennsylvania": "PA", "Rhode Island": "RI", "South Carolina": "SC",
-    "South Dakota": "SD", "Tennessee": "TN", "Texas": "TX", "Utah": "UT",
-    "Vermont": "VT", "Virginia": "VA", "Washington": "WA", "West Virginia": "WV",
-    "Wisconsin": "WI", "Wyoming": "WY"
-}
+# Cities processed concurrently. Kept small to stay polite to weather.gov, and
+# no larger than the AGE connection pool (age_utils.AGE_POOL_MAX_SIZE).
+MAX_WORKERS = 4
+
+TOP_CITIES_URL = "https://worldpopulationreview.com/us-cities"
+
+# The ranking changes at most yearly, so refetch the page at most weekly
+TOP_CITIES_CACHE_TTL_DAYS = 7
+
+# Matches the JS string literal assigned to `const data`, honoring escaped quotes
+_DATA_LITERAL_RE = re.compile(r'const\s+data\s*=\s*"((?:[^"\\]|\\.)*)"')
+
+_city_cache = JsonFileCache(
+    CACHE_DIR / "top_cities.json", ttl_seconds=TOP_CITIES_CACHE_TTL_DAYS * 24 * 3600
+)
 
 # Hardcoded fallback list (2025 US Census estimates)
 DEFAULT_CITIES_2025 = [
@@ -71,19 +74,24 @@ def fetch_top_10_cities() -> list[str]:
         list[str]: List of city names with state abbreviations
     """
     current_year = datetime.now().year
-    url = "https://worldpopulationreview.com/us-cities"
+
+    cached = _city_cache.get(TOP_CITIES_URL)
+    if cached is not None:
+        logger.info("Using cached top 10 US cities list")
+        return cached
 
     try:
-        resp = requests.get(url, timeout=10)
+        resp = requests.get(TOP_CITIES_URL, timeout=10)
         resp.raise_for_status()
         html = resp.text
 
-        # Find the JSON data embedded in the page (assigned to const data = "[...]")
-        match = re.search(r'const\s+data\s*=\s*"(\[.*?\])"\s*;', html, re.DOTALL)
+        # The city data is embedded in the page as a JS string literal
+        # (const data = "[...]"); the literal uses JSON string escapes, so
+        # a JSON decoder handles it correctly, including non-ASCII names.
+        match = _DATA_LITERAL_RE.search(html)
         if match:
-            # The JSON is escaped, need to decode it
-            json_str = match.group(1).encode().decode('unicode_escape')
-            cities_data = json.loads(json_str)
+            json_str = orjson.loads(f'"{match.group(1)}"')
+            cities_data = orjson.loads(json_str)
 
             # Sort by population (pop2025 or population field) and take top 10
             cities_data.sort(key=lambda x: x.get("pop2025", x.get("population", 0)), reverse=True)
@@ -97,13 +105,14 @@ def fetch_top_10_cities() -> list[str]:
                 cities.append(f"{name}, {state_abbrev}")
 
             logger.info("Fetched top 10 US cities by population from worldpopulationreview.com")
+            _city_cache.set(TOP_CITIES_URL, cities)
             return cities
 
         raise ValueError("Could not parse city data from worldpopulationreview.com")
 
     except Exception as e:
-        logger.warning(f"Could not fetch city data: {e}")
-        logger.warning(f"Defaulting to hard-coded {current_year} list of 10 most populous US cities")
+        logger.warning("Could not fetch city data: %s", e)
+        logger.warning("Defaulting to hard-coded %d list of 10 most populous US cities", current_year)
         return DEFAULT_CITIES_2025
 
 
@@ -114,22 +123,28 @@ def main():
     # Fetch top 10 cities (with fallback to hardcoded list)
     cities = fetch_top_10_cities()
 
-    logger.info(f"Creating graph nodes for {len(cities)} cities...")
-    logger.info(f"Cities: {', '.join(cities)}\n")
+    logger.info("Creating graph nodes for %d cities...", len(cities))
+    logger.info("Cities: %s\n", ", ".join(cities))
+
+    # Labels must exist before cities are written concurrently
+    ensure_graph_labels()
 
     success_count = 0
-    for city in cities:
-        try:
-            logger.info(f"Processing {city}...")
-            result = create_city_graph(city)
-            logger.info(f"  Created {result['nodes_created']['temperature_nodes']} temperature nodes")
-            logger.info(f"  Created {result['nodes_created']['humidity_nodes']} humidity nodes")
-            success_count += 1
-        except Exception as e:
-            logger.warning(f"Could not create graph for {city}: {e}")
-
-    logger.info(f"\nWeather relationship graph creation complete!")
-    logger.info(f"Successfully processed {success_count}/{len(cities)} cities")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(create_city_graph, city): city for city in cities}
+        for future in as_completed(futures):
+            city = futures[future]
+            try:
+                result = future.result()
+                logger.info("Processed %s", city)
+                logger.info("  Created %d temperature nodes", result['nodes_created']['temperature_nodes'])
+                logger.info("  Created %d humidity nodes", result['nodes_created']['humidity_nodes'])
+                success_count += 1
+            except Exception as e:
+                logger.warning("Could not create graph for %s: %s", city, e)
+
+    logger.info("\nWeather relationship graph creation complete!")
+    logger.info("Successfully processed %d/%d cities", success_count, len(cities))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+"""
+Caching layer for geocoding lookups.
+
+Nominatim (OpenStreetMap) is rate limited to one request per second, and city
+coordinates practically never change, so repeated lookups of the same location
+are served from an on-disk JSON cache in CACHE_DIR instead of the network.
+Entries survive process and container restarts and expire after
+GEOCODE_CACHE_TTL_DAYS. The cache keeps its entries in memory once loaded,
+so repeat lookups do no I/O.
+
+Location names are normalized (whitespace collapsed, case-folded) before
+lookup, so "denver,  CO" and "Denver, CO" share an entry.
+
+Usage:
+    from app.geocode_cache import cached_geocode
+
+    @cached_geocode
+    def _lookup(location_name: str) -> tuple[float, float, str, str | None]:
+        ...
+"""
+
+import functools
+
+from .config import CACHE_DIR, GEOCODE_CACHE_TTL_DAYS
+from .json_cache import JsonFileCache
+
+# Versioned file name: v3 entries are (latitude, longitude, address, state)
+_disk_cache = JsonFileCache(
+    CACHE_DIR / "geocode_v3.json", ttl_seconds=GEOCODE_CACHE_TTL_DAYS * 24 * 3600
+)
+
+
+def normalize_location_name(location_name: str) -> str:
+    """
+    Normalize a location name for use as a cache key.
+
+    Args:
+        location_name: Human-readable location (e.g., "  San Diego,  CA ")
+
+    Returns:
+        str: Normalized key (e.g., "san diego, ca")
+    """
+    return " ".join(location_name.split()).casefold()
+
+
+def cached_geocode(geocode):
+    """
+    Decorate a geocoding function with the on-disk cache.
+
+    The wrapped function is called with the normalized location name and must
+    return a JSON-serializable tuple (e.g., latitude, longitude, address).
+    Exceptions are not cached, so failed lookups are retried on the next call.
+
+    Args:
+        geocode: Function mapping a location name to a result tuple
+
+    Returns:
+        Callable with the same signature, backed by the cache
+    """
+    @functools.wraps(geocode)
+    def wrapper(location_name: str) -> tuple:
+        key = normalize_location_name(location_name)
+        cached = _disk_cache.get(key)
+        if cached is not None:
+            return tuple(cached)
+
+        result = geocode(key)
+        _disk_cache.set(key, list(result))
+        return result
+
+    return wrapper
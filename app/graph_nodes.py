@@ -21,9 +21,9 @@ from datetime import datetime
 from .config import get_logger
 from .location_resolver import resolve_location
 from .age_utils import (
-    age_cursor, GRAPH_NAME,
+    age_cursor, execute_cypher,
     categorize_temperature, categorize_humidity,
-    create_weather_node, create_concurrent_edges_between,
+    create_weather_nodes, create_concurrent_edges_between,
     format_timestamp
 )
 from .apache_age_ops import calculate_distance_to_coast
@@ -32,42 +32,61 @@ from .weather_fetcher import fetch_grid_data, parse_grid_values, WeatherAPIError
 logger = get_logger(__name__)
 
 
+# Time of day for each hour 0-23: morning 5-11, midday 12-16, evening 17-20,
+# night otherwise
+_TIME_CAT = (
+    ("night",) * 5 + ("morning",) * 7 + ("midday",) * 5 + ("evening",) * 4 + ("night",) * 3
+)
+
+
 def get_time_category(hour: int) -> str:
     """Categorize hour into time of day."""
-    if 5 <= hour < 12:
-        return "morning"
-    elif 12 <= hour < 17:
-        return "midday"
-    elif 17 <= hour < 21:
-        return "evening"
-    else:
-        return "night"
+    return _TIME_CAT[hour]
 
 
-def create_location_node(city_name: str, state: str, lat: float, lon: float):
-    """Create a Location node for the city."""
+def create_location_node(city_name: str, state: str, lat: float, lon: float, cur=None):
+    """
+    Create a Location node for the city.
+
+    Args:
+        city_name: Name of the city
+        state: 2-letter state code
+        lat: Latitude coordinate
+        lon: Longitude coordinate
+        cur: AGE cursor (optional). If given, the caller owns the transaction
+             and must commit; otherwise a connection is borrowed and committed.
+    """
+    if cur is None:
+        with age_cursor() as (cur, conn):
+            result = create_location_node(city_name, state, lat, lon, cur=cur)
+            conn.commit()
+        return result
+
     distance_to_coast = calculate_distance_to_coast(lat, lon)
 
-    with age_cursor() as (cur, conn):
-        cypher = f"""
-            SELECT * FROM cypher('{GRAPH_NAME}', $$
-                MERGE (l:Location {{name: '{city_name}', state: '{state}'}})
-                SET l.latitude = {lat},
-                    l.longitude = {lon},
-                    l.distance_to_coast_km = {distance_to_coast}
-                RETURN l
-            $$) as (l agtype)
-        """
-        cur.execute(cypher)
-        conn.commit()
+    execute_cypher(cur, """
+        MERGE (l:Location {name: $name, state: $state})
+        SET l.latitude = $lat,
+            l.longitude = $lon,
+            l.distance_to_coast_km = $distance
+        RETURN l
+    """, {
+        "name": city_name,
+        "state": state,
+        "lat": lat,
+        "lon": lon,
+        "distance": distance_to_coast,
+    }, columns="(l agtype)")
 
-    logger.info(f"Created Location node for {city_name}: {distance_to_coast}km from coast")
+    logger.info("Created Location node for %s: %skm from coast", city_name, distance_to_coast)
     return {"city": city_name, "distance_to_coast_km": distance_to_coast}
 
 
-def create_weather_nodes_from_api(city_name: str, lat: float, lon: float) -> dict:
+def fetch_weather_rows(city_name: str, lat: float, lon: float) -> tuple[list[dict], list[dict]]:
     """
-    Create Temperature and Humidity nodes from weather.gov API data.
+    Fetch weather.gov grid data and build Temperature and Humidity node rows.
+
+    Does no database work, so callers can fetch before borrowing a connection.
 
     Args:
         city_name: Name of the city
@@ -75,50 +94,78 @@ def create_weather_nodes_from_api(city_name: str, lat: float, lon: float) -> dic
         lon: Longitude coordinate
 
     Returns:
-        dict with counts of nodes created
+        tuple: (temperature rows, humidity rows) for write_weather_nodes()
     """
-    logger.info(f"Fetching weather data from weather.gov for {city_name}...")
+    logger.info("Fetching weather data from weather.gov for %s...", city_name)
 
     try:
         grid_data = fetch_grid_data(lat, lon)
     except WeatherAPIError as e:
-        logger.error(f"Failed to fetch weather data: {e}")
+        logger.error("Failed to fetch weather data: %s", e)
         raise
 
     # Parse weather properties
     temperatures = parse_grid_values(grid_data, "temperature")
     humidities = parse_grid_values(grid_data, "relativeHumidity")
 
-    logger.info(f"Retrieved {len(temperatures)} temp, {len(humidities)} humidity readings")
+    logger.info("Retrieved %d temp, %d humidity readings", len(temperatures), len(humidities))
 
     # Create a lookup for humidity by timestamp
-    humidity_lookup = {ts: val for ts, val in humidities}
-
-    temp_count = 0
-    humidity_count = 0
+    humidity_lookup = dict(humidities)
+
+    temp_rows = []
+    humidity_rows = []
+
+    for timestamp, temp_f in temperatures:
+        ts_str = format_timestamp(timestamp)
+        time_category = _TIME_CAT[timestamp.hour]
+
+        temp_rows.append({
+            "timestamp": ts_str,
+            "location": city_name,
+            "time_of_day": time_category,
+            "value": temp_f,
+            "category": categorize_temperature(temp_f),
+        })
+
+        # Add a Humidity row if we have data for this timestamp
+        humidity = humidity_lookup.get(timestamp)
+        if humidity is not None:
+            humidity_rows.append({
+                "timestamp": ts_str,
+                "location": city_name,
+                "time_of_day": time_category,
+                "value": humidity,
+                "category": categorize_humidity(humidity),
+            })
+
+    return temp_rows, humidity_rows
+
+
+def write_weather_nodes(city_name: str, temp_rows: list[dict], humidity_rows: list[dict],
+                        cur=None) -> dict:
+    """
+    Create Temperature and Humidity nodes from rows built by fetch_weather_rows().
 
-    with age_cursor() as (cur, conn):
-        for timestamp, temp_f in temperatures:
-            ts_str = format_timestamp(timestamp)
-            time_category = get_time_category(timestamp.hour)
-
-            # Create Temperature node
-            heat_cat = categorize_temperature(temp_f)
-            create_weather_node(cur, "Temperature", ts_str, city_name, time_category,
-                              "value_f", temp_f, "heat_category", heat_cat)
-            temp_count += 1
-
-            # Create Humidity node if we have data for this timestamp
-            humidity = humidity_lookup.get(timestamp)
-            if humidity is not None:
-                comfort = categorize_humidity(humidity)
-                create_weather_node(cur, "Humidity", ts_str, city_name, time_category,
-                                  "value_percent", humidity, "comfort_level", comfort)
-                humidity_count += 1
+    Args:
+        city_name: Name of the city
+        temp_rows: Temperature node rows
+        humidity_rows: Humidity node rows
+        cur: AGE cursor (optional). If given, the caller owns the transaction
+             and must commit; otherwise a connection is borrowed and committed.
 
-        conn.commit()
+    Returns:
+        dict with counts of nodes created
+    """
+    if cur is None:
+        with age_cursor() as (cur, conn):
+            temp_count, humidity_count = _write_weather_rows(cur, temp_rows, humidity_rows)
+            conn.commit()
+    else:
+        temp_count, humidity_count = _write_weather_rows(cur, temp_rows, humidity_rows)
 
-    logger.info(f"Created {temp_count} Temperature, {humidity_count} Humidity nodes for {city_name}")
+    logger.info("Created %d Temperature, %d Humidity nodes for %s",
+                temp_count, humidity_count, city_name)
 
     return {
         "temperature_nodes": temp_count,
@@ -126,21 +173,65 @@ def create_weather_nodes_from_api(city_name: str, lat: float, lon: float) -> dic
     }
 
 
-def create_edges_for_city(city_name: str):
-    """Create relationship edges between nodes for a specific city."""
-    logger.info(f"Creating edges for {city_name}...")
+def create_weather_nodes_from_api(city_name: str, lat: float, lon: float, cur=None) -> dict:
+    """
+    Create Temperature and Humidity nodes from weather.gov API data.
 
-    edge_counts = {}
+    The fetch runs before any connection is borrowed. Callers that pass their
+    own cursor should call fetch_weather_rows() before opening the transaction
+    and write_weather_nodes() inside it instead.
 
-    with age_cursor() as (cur, conn):
-        # CONCURRENT_WITH edges (Temperature <-> Humidity)
-        edge_counts['concurrent_temp_humidity'] = create_concurrent_edges_between(
-            cur, "Temperature", "Humidity", city_name
-        )
+    Args:
+        city_name: Name of the city
+        lat: Latitude coordinate
+        lon: Longitude coordinate
+        cur: AGE cursor (optional). If given, the caller owns the transaction
+             and must commit; otherwise a connection is borrowed and committed.
+
+    Returns:
+        dict with counts of nodes created
+    """
+    temp_rows, humidity_rows = fetch_weather_rows(city_name, lat, lon)
+    return write_weather_nodes(city_name, temp_rows, humidity_rows, cur=cur)
 
-        conn.commit()
 
-    logger.info(f"Created edges for {city_name}: {edge_counts}")
+def _write_weather_rows(cur, temp_rows: list[dict], humidity_rows: list[dict]) -> tuple[int, int]:
+    """Write Temperature and Humidity rows; returns (temperature, humidity) counts."""
+    # The two batch statements are independent, so pipeline mode sends both
+    # before waiting for either result (one round-trip instead of two)
+    with cur.connection.pipeline():
+        temp_count = create_weather_nodes(cur, "Temperature", "value_f",
+                                          "heat_category", temp_rows)
+        humidity_count = create_weather_nodes(cur, "Humidity", "value_percent",
+                                              "comfort_level", humidity_rows)
+    return temp_count, humidity_count
+
+
+def create_edges_for_city(city_name: str, cur=None):
+    """
+    Create relationship edges between nodes for a specific city.
+
+    Args:
+        city_name: Name of the city
+        cur: AGE cursor (optional). If given, the caller owns the transaction
+             and must commit; otherwise a connection is borrowed and committed.
+    """
+    if cur is None:
+        with age_cursor() as (cur, conn):
+            result = create_edges_for_city(city_name, cur=cur)
+            conn.commit()
+        return result
+
+    logger.info("Creating edges for %s...", city_name)
+
+    edge_counts = {}
+
+    # CONCURRENT_WITH edges (Temperature <-> Humidity)
+    edge_counts['concurrent_temp_humidity'] = create_concurrent_edges_between(
+        cur, "Temperature", "Humidity", city_name
+    )
+
+    logger.info("Created edges for %s: %s", city_name, edge_counts)
 
     return edge_counts
 
@@ -171,19 +262,27 @@ def create_city_graph(location_name: str) -> dict:
         state = location_info.state or "US"
         lat = location_info.latitude
         lon = location_info.longitude
-        logger.info(f"Resolved {location_name} -> {city}, {state} ({lat:.4f}, {lon:.4f})")
+        logger.info("Resolved %s -> %s, %s (%.4f, %.4f)", location_name, city, state, lat, lon)
     except ValueError as e:
-        logger.error(f"Could not resolve location '{location_name}': {e}")
+        logger.error("Could not resolve location '%s': %s", location_name, e)
         raise
 
-    # Create Location node
-    location_result = create_location_node(city, state, lat, lon)
+    # Fetch from weather.gov before borrowing a pooled connection, so no
+    # connection (or open transaction) is held across the HTTP round-trip
+    temp_rows, humidity_rows = fetch_weather_rows(city, lat, lon)
 
-    # Create weather nodes from real weather.gov API data
-    nodes_created = create_weather_nodes_from_api(city, lat, lon)
+    # All three phases share one transaction and commit once
+    with age_cursor() as (cur, conn):
+        # Create weather nodes from real weather.gov API data
+        nodes_created = write_weather_nodes(city, temp_rows, humidity_rows, cur=cur)
 
-    # Create relationship edges
-    edges_created = create_edges_for_city(city)
+        # Create Location node
+        location_result = create_location_node(city, state, lat, lon, cur=cur)
+
+        # Create relationship edges
+        edges_created = create_edges_for_city(city, cur=cur)
+
+        conn.commit()
 
     return {
         "city": city,
@@ -214,16 +313,16 @@ Examples:
 
     try:
         result = create_city_graph(args.location)
-        logger.info(f"Successfully created graph for {result['city']}, {result['state']}")
-        logger.info(f"  Distance to coast: {result['distance_to_coast_km']}km")
-        logger.info(f"  Temperature nodes: {result['nodes_created']['temperature_nodes']}")
-        logger.info(f"  Humidity nodes: {result['nodes_created']['humidity_nodes']}")
-        logger.info(f"  Total edges: {sum(result['edges_created'].values())}")
+        logger.info("Successfully created graph for %s, %s", result['city'], result['state'])
+        logger.info("  Distance to coast: %skm", result['distance_to_coast_km'])
+        logger.info("  Temperature nodes: %d", result['nodes_created']['temperature_nodes'])
+        logger.info("  Humidity nodes: %d", result['nodes_created']['humidity_nodes'])
+        logger.info("  Total edges: %d", sum(result['edges_created'].values()))
     except ValueError as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         sys.exit(1)
 
 
@@ -17,7 +17,6 @@ Note:
 """
 import argparse
 import sys
-from datetime import date
 
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
@@ -33,40 +32,48 @@ logger = get_logger(__name__)
 
 
 
-def upsert_weather(db: Session, d: date, hi: float, lo: float,
+def upsert_weather(db: Session, forecast_data: list[dict],
                    location_name: str, lat: float, lon: float) -> None:
     """
-    Insert or update weather data for a specific date and location.
+    Insert or update weather data for a location, one row per forecast day.
 
     Uses PostgreSQL's ON CONFLICT (upsert) to handle duplicate entries gracefully.
-    If a record with the same (date, latitude, longitude) exists, it updates
-    the temperatures; otherwise, it inserts a new record.
+    All days are sent as a single multi-row INSERT; if a record with the same
+    (date, latitude, longitude) exists, its temperatures are updated instead.
 
     Args:
         db: SQLAlchemy database session
-        d: Forecast date
-        hi: High temperature in Fahrenheit
-        lo: Low temperature in Fahrenheit
+        forecast_data: Days with 'date', 'high_temp' and 'low_temp' keys
         location_name: User-provided location string (e.g., "Denver, CO")
         lat: Latitude coordinate
         lon: Longitude coordinate
     """
+    if not forecast_data:
+        return
+
+    rows = [
+        {
+            "date": day["date"],
+            "high_temp_f": day["high_temp"],
+            "low_temp_f": day["low_temp"],
+            "location_name": location_name,
+            "latitude": lat,
+            "longitude": lon,
+        }
+        for day in forecast_data
+    ]
+
     # Build upsert statement using PostgreSQL dialect
-    stmt = (
-        insert(WeatherData)
-        .values(
-            date=d,
-            high_temp_f=hi,
-            low_temp_f=lo,
-            location_name=location_name,
-            latitude=lat,
-            longitude=lon
-        )
-        # ON CONFLICT: if (date, lat, lon) already exists, update temps instead of error
-        .on_conflict_do_update(
-            index_elements=["date", "latitude", "longitude"],
-            set_={"high_temp_f": hi, "low_temp_f": lo, "location_name": location_name},
-        )
+    stmt = insert(WeatherData).values(rows)
+    # ON CONFLICT: if (date, lat, lon) already exists, update temps instead of error.
+    # EXCLUDED refers to each conflicting row of the VALUES list.
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["date", "latitude", "longitude"],
+        set_={
+            "high_temp_f": stmt.excluded.high_temp_f,
+            "low_temp_f": stmt.excluded.low_temp_f,
+            "location_name": stmt.excluded.location_name,
+        },
     )
     db.execute(stmt)
 
@@ -78,10 +85,10 @@ def ingest_weather(location_name: str) -> None:
     # Convert location name to coordinates
     try:
         lat, lon, display_name = geocode_location(location_name)
-        logger.info(f"Location: {display_name}")
-        logger.info(f"Coordinates: {lat:.4f}, {lon:.4f}")
+        logger.info("Location: %s", display_name)
+        logger.info("Coordinates: %.4f, %.4f", lat, lon)
     except ValueError as e:
-        logger.error(f"Geocoding error: {e}")
+        logger.error("Geocoding error: %s", e)
         sys.exit(1)
 
     # Fetch forecast from weather.gov
@@ -93,27 +100,23 @@ def ingest_weather(location_name: str) -> None:
         logger.error("The weather.gov API only provides forecasts for US locations.")
         sys.exit(1)
     except WeatherAPIError as e:
-        logger.error(f"Error fetching weather data: {e}")
+        logger.error("Error fetching weather data: %s", e)
         sys.exit(1)
 
     # Save all forecast data
     with SessionLocal() as db:
-        for day in forecast_data:
-            upsert_weather(
-                db, day["date"], day["high_temp"], day["low_temp"],
-                location_name, lat, lon
-            )
+        upsert_weather(db, forecast_data, location_name, lat, lon)
         db.commit()
 
-    logger.info(f"Saved {len(forecast_data)} days of weather data")
+    logger.info("Saved %d days of weather data", len(forecast_data))
 
     # Create graph nodes and relationships
     logger.info("Creating graph nodes and relationships...")
     try:
         result = create_city_graph(location_name)
-        logger.info(f"Graph nodes created for {result['city']}")
+        logger.info("Graph nodes created for %s", result['city'])
     except Exception as e:
-        logger.warning(f"Could not create graph nodes: {e}")
+        logger.warning("Could not create graph nodes: %s", e)
         logger.warning("Weather data was saved, but graph nodes were not created.")
 
 
@@ -0,0 +1,166 @@
+"""
+Small persistent key/value cache backed by a JSON file.
+
+Used to remember results of slow or rate-limited network lookups (e.g.,
+geocoding) across process restarts. Entries expire after a configurable TTL.
+
+The cache is loaded lazily on first access and rewritten atomically on every
+update, so a crash mid-write never leaves a corrupt file behind. Several
+processes (the API, CLI scripts, Airflow) may share a cache file: updates
+re-read the file and merge under an exclusive file lock, so one process never
+drops entries written by another. Failures to read or write the file are
+logged and otherwise ignored - the cache is an optimization, never a
+requirement.
+
+Usage:
+    from app.json_cache import JsonFileCache
+
+    cache = JsonFileCache(CACHE_DIR / "example.json", ttl_seconds=86400)
+    value = cache.get("key")
+    if value is None:
+        value = expensive_lookup()
+        cache.set("key", value)
+"""
+
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from .config import get_logger
+
+logger = get_logger(__name__)
+
+
+class JsonFileCache:
+    """
+    Thread-safe JSON file cache with per-entry expiry.
+
+    Values must be JSON-serializable. Each entry is stored alongside the time
+    it was cached (``fetched_at``, Unix epoch seconds).
+
+    Attributes:
+        path: Location of the JSON cache file
+        ttl_seconds: Age after which an entry is treated as missing
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Location of the JSON cache file (created on first write)
+            ttl_seconds: Age after which an entry is treated as missing
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+        self._entries = None
+        self._mtime_ns = None
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        """Read entries from disk, remembering the file's modification time."""
+        try:
+            self._mtime_ns = self.path.stat().st_mtime_ns
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache file %s: %s", self.path, e)
+            return {}
+
+    def _load(self) -> dict:
+        """Load entries from disk on first use."""
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def _changed_on_disk(self) -> bool:
+        """Return True if another process has rewritten the file since it was read."""
+        try:
+            return self.path.stat().st_mtime_ns != self._mtime_ns
+        except OSError:
+            return False
+
+    def _save(self, entries: dict):
+        """Atomically write entries to disk (temp file + rename)."""
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+                # Flush to disk before the rename, so a crash can't leave the
+                # cache file pointing at a truncated write
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._mtime_ns = self.path.stat().st_mtime_ns
+        except OSError as e:
+            logger.warning("Could not write cache file %s: %s", self.path, e)
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+
+    def _is_expired(self, entry: dict, now: float) -> bool:
+        """Return True if an entry is older than the TTL."""
+        return now - entry["fetched_at"] > self.ttl_seconds
+
+    def get(self, key: str):
+        """
+        Get a cached value.
+
+        On a miss, the file is re-read if another process has updated it.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            entries = self._load()
+            if key not in entries and self._changed_on_disk():
+                entries = self._entries = self._read()
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            if self._is_expired(entry, time.time()):
+                # Drop the stale entry; the file is rewritten on the next set()
+                del entries[key]
+                return None
+        return entry["value"]
+
+    def set(self, key: str, value):
+        """
+        Store a value and persist the cache to disk.
+
+        The file is re-read and merged under an exclusive lock, so entries
+        written by other processes since this one loaded it are kept.
+        Expired entries are dropped from the file.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+        """
+        with self._lock:
+            now = time.time()
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                lock_file = open(self._lock_path, "a")
+            except OSError as e:
+                logger.warning("Could not lock cache file %s: %s", self.path, e)
+                self._load()[key] = {"value": value, "fetched_at": now}
+                return
+
+            with lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                entries = {
+                    k: entry for k, entry in self._read().items()
+                    if not self._is_expired(entry, now)
+                }
+                entries[key] = {"value": value, "fetched_at": now}
+                self._save(entries)
+                self._entries = entries
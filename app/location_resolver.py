@@ -14,21 +14,40 @@ Why this is necessary:
     into precise coordinates before calling weather.gov.
 
 Geocoding Service:
-    Uses OpenStreetMap's Nominatim service (via geopy library) to resolve
-    location names to coordinates. This is a free, open-source geocoding service.
+    Uses OpenStreetMap's Nominatim search API (called directly over a pooled
+    HTTP session) to resolve location names to coordinates and a structured
+    address. This is a free, open-source geocoding service. Results are cached
+    (see geocode_cache) to respect its rate limits.
 
 Example:
     "Denver" → (39.7392, -104.9903)
     "San Diego, CA" → (32.7157, -117.1611)
 """
 
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+import threading
+import time
+
+import requests
 
 from .config import USER_AGENT, API_TIMEOUT, get_logger
+from .geocode_cache import cached_geocode
+from .state_codes import STATE_ABBREV, STATE_CODES
 
 logger = get_logger(__name__)
 
+NOMINATIM_SEARCH_URL = "https://nominatim.openstreetmap.org/search"
+
+# Shared HTTP session, so the keep-alive connection to Nominatim is reused
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = USER_AGENT
+
+# Nominatim's usage policy allows at most one request per second. Callers may
+# geocode from several threads, so requests are spaced out process-wide.
+NOMINATIM_MIN_INTERVAL = 1.0
+
+_nominatim_lock = threading.Lock()
+_nominatim_last_request = 0.0
+
 
 class LocationInfo:
     """Container for location information."""
@@ -45,10 +64,66 @@ class LocationInfo:
         return f"LocationInfo(city={self.city}, state={self.state}, lat={self.latitude}, lon={self.longitude})"
 
 
+def _wait_for_nominatim():
+    """Block until at least NOMINATIM_MIN_INTERVAL has passed since the last request."""
+    global _nominatim_last_request
+    with _nominatim_lock:
+        delay = _nominatim_last_request + NOMINATIM_MIN_INTERVAL - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        _nominatim_last_request = time.monotonic()
+
+
+@cached_geocode
+def _lookup(location_name: str) -> tuple[float, float, str, str | None]:
+    """
+    Query Nominatim for a location.
+
+    Args:
+        location_name: Human-readable location (e.g., "San Diego", "Denver, CO")
+
+    Returns:
+        tuple: (latitude, longitude, full_address, state), where state comes
+        from Nominatim's structured address and may be None
+
+    Raises:
+        ValueError: If location cannot be found or geocoding fails
+    """
+    _wait_for_nominatim()
+    try:
+        resp = _SESSION.get(NOMINATIM_SEARCH_URL, params={
+            "q": location_name,
+            "format": "jsonv2",
+            "limit": 1,
+            "addressdetails": 1,
+        }, timeout=API_TIMEOUT)
+        resp.raise_for_status()
+        results = resp.json()
+    except requests.Timeout as error:
+        raise ValueError(f"Geocoding timed out for: {location_name}") from error
+    except (requests.RequestException, ValueError) as error:
+        raise ValueError(f"Geocoding service error: {error}") from error
+
+    if not results:
+        raise ValueError(f"Could not find location: {location_name}")
+
+    place = results[0]
+    address = place.get("address", {})
+    # ISO 3166-2 subdivision code, e.g. "US-CO"
+    state = address.get("ISO3166-2-lvl4", "").removeprefix("US-") or None
+    if state not in STATE_CODES:
+        state = STATE_ABBREV.get(address.get("state"))
+
+    return float(place["lat"]), float(place["lon"]), place["display_name"], state
+
+
 def geocode_location(location_name: str) -> tuple[float, float, str]:
     """
     Convert a location name to coordinates using OpenStreetMap Nominatim.
 
+    Results are cached in memory and on disk (see geocode_cache), so repeat
+    lookups of the same location skip the network entirely.
+
     Args:
         location_name: Human-readable location (e.g., "San Diego", "Denver, CO")
 
@@ -63,16 +138,8 @@ def geocode_location(location_name: str) -> tuple[float, float, str]:
         >>> print(f"{lat}, {lon}")
         39.7392, -104.9903
     """
-    geolocator = Nominatim(user_agent=USER_AGENT)
-    try:
-        location = geolocator.geocode(location_name, timeout=API_TIMEOUT)
-        if location is None:
-            raise ValueError(f"Could not find location: {location_name}")
-        return location.latitude, location.longitude, location.address
-    except GeocoderTimedOut as error:
-        raise ValueError(f"Geocoding timed out for: {location_name}") from error
-    except GeocoderServiceError as error:
-        raise ValueError(f"Geocoding service error: {error}") from error
+    lat, lon, display_name, _ = _lookup(location_name)
+    return lat, lon, display_name
 
 
 def resolve_location(location_name: str) -> LocationInfo:
@@ -96,45 +163,27 @@ def resolve_location(location_name: str) -> LocationInfo:
         >>> print(f"{info.city}, {info.state}: {info.latitude}, {info.longitude}")
         Denver, CO: 39.7392, -104.9903
     """
-    lat, lon, display_name = geocode_location(location_name)
-
-    # Try to extract city and state from display name
-    # Display name format varies, but often: "City, County, State, Country"
-    city = None
-    state = None
-
-    # US state name to abbreviation mapping
-    state_abbrevs = {
-        "Alabama": "AL", "Alaska": "AK", "Arizona": "AZ", "Arkansas": "AR",
-        "California": "CA", "Colorado": "CO", "Connecticut": "CT", "Delaware": "DE",
-        "Florida": "FL", "Georgia": "GA", "Hawaii": "HI", "Idaho": "ID",
-        "Illinois": "IL", "Indiana": "IN", "Iowa": "IA", "Kansas": "KS",
-        "Kentucky": "KY", "Louisiana": "LA", "Maine": "ME", "Maryland": "MD",
-        "Massachusetts": "MA", "Michigan": "MI", "Minnesota": "MN", "Mississippi": "MS",
-        "Missouri": "MO", "Montana": "MT", "Nebraska": "NE", "Nevada": "NV",
-        "New Hampshire": "NH", "New Jersey": "NJ", "New Mexico": "NM", "New York": "NY",
-        "North Carolina": "NC", "North Dakota": "ND", "Ohio": "OH", "Oklahoma": "OK",
-        "Oregon": "OR", "Pennsylvania": "PA", "Rhode Island": "RI", "South Carolina": "SC",
-        "South Dakota": "SD", "Tennessee": "TN", "Texas": "TX", "Utah": "UT",
-        "Vermont": "VT", "Virginia": "VA", "Washington": "WA", "West Virginia": "WV",
-        "Wisconsin": "WI", "Wyoming": "WY", "District of Columbia": "DC"
-    }
+    lat, lon, display_name, state = _lookup(location_name)
 
+    # The city is the first part of the display name ("City, County, State,
+    # ZIP, Country"). Nominatim's structured address can name a different
+    # place (e.g. a borough's parent city), which would change the names of
+    # stored locations and graph nodes.
     parts = [p.strip() for p in display_name.split(',')]
-    if len(parts) >= 1:
-        city = parts[0]
-
-    # Look for state in any part of the display name
-    for part in parts:
-        part = part.strip()
-        # Check if it's a 2-letter state code
-        if len(part) == 2 and part.upper() in state_abbrevs.values():
-            state = part.upper()
-            break
-        # Check if it's a full state name
-        if part in state_abbrevs:
-            state = state_abbrevs[part]
-            break
+    city = parts[0]
+
+    if state is None:
+        # The structured address lacks a US state; look for one near the end
+        # of the display name, where Nominatim puts it
+        for part in reversed(parts[-4:]):
+            # Check if it's a 2-letter state code
+            if len(part) == 2 and part.upper() in STATE_CODES:
+                state = part.upper()
+                break
+            # Check if it's a full state name
+            if part in STATE_ABBREV:
+                state = STATE_ABBREV[part]
+                break
 
     return LocationInfo(
         latitude=lat,
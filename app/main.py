@@ -1,20 +1,28 @@
 # app/main.py
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Generator
-import uuid
+import secrets
+import tempfile
+import threading
+import time
 
+import orjson
 from fastapi import FastAPI, HTTPException, Query, Depends, Request
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
 from datetime import datetime, date as date_cls
-from zoneinfo import ZoneInfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from pathlib import Path
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import Row, bindparam, select
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from .orm_model import Base, engine, SessionLocal, WeatherData, WeatherDataOut
-from .config import DEFAULT_LAT, DEFAULT_LON, DEFAULT_TIMEZONE, get_logger
-from .graph_nodes import create_location_node, create_weather_nodes_from_api, create_edges_for_city
+from .orm_model import Base, engine, SessionLocal, WeatherData, WeatherDataOut, SCHEMA_VERSION, upgrade_schema
+from .config import DEFAULT_LAT, DEFAULT_LON, DEFAULT_TIMEZONE, RUN_MIGRATIONS, get_logger
+from .age_utils import age_cursor, ensure_graph_labels
+from .graph_nodes import create_location_node, fetch_weather_rows, write_weather_nodes, create_edges_for_city
 from .location_resolver import resolve_location
 
 logger = get_logger(__name__)
@@ -28,13 +36,13 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
     """Add unique request ID to each request for tracing."""
 
     async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())[:8]
-        logger.info(f"[{request_id}] {request.method} {request.url.path}")
+        request_id = secrets.token_hex(4)
+        logger.info("[%s] %s %s", request_id, request.method, request.url.path)
 
         response = await call_next(request)
 
         response.headers["X-Request-ID"] = request_id
-        logger.info(f"[{request_id}] Response: {response.status_code}")
+        logger.info("[%s] Response: %s", request_id, response.status_code)
         return response
 
 
@@ -45,9 +53,20 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events."""
-    # Startup
-    logger.info("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    # Startup: create tables only when asked to, or once per schema version.
+    # create_all checks pg_class for every table, so skip it on warm restarts.
+    schema_sentinel = Path(tempfile.gettempdir()) / f"weather_api_schema.{SCHEMA_VERSION}"
+    if RUN_MIGRATIONS or not schema_sentinel.exists():
+        logger.info("Creating database tables...")
+        Base.metadata.create_all(bind=engine)
+        upgrade_schema()
+        schema_sentinel.touch()
+    # Graph writes from concurrent requests would otherwise race to create labels.
+    # The /weather endpoints don't need the graph, so a failure here only warns.
+    try:
+        ensure_graph_labels()
+    except Exception as e:
+        logger.warning("Could not ensure graph labels: %s", e)
     logger.info("Application started")
 
     yield
@@ -72,8 +91,14 @@ def get_session() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+@lru_cache(maxsize=1)
 def get_system_timezone() -> str:
-    """Get system timezone, defaulting to configured timezone."""
+    """
+    Get system timezone, defaulting to configured timezone.
+
+    The result is cached for the life of the process; the container's
+    timezone does not change while it runs.
+    """
     # Try /etc/timezone (Debian/Ubuntu)
     tz_file = Path("/etc/timezone")
     if tz_file.exists():
@@ -88,85 +113,215 @@ def get_system_timezone() -> str:
             return target.split("/zoneinfo/")[-1]
     return DEFAULT_TIMEZONE
 
-def resolve_today() -> str:
-    tz = get_system_timezone()
-    return datetime.now(ZoneInfo(tz)).date().isoformat()
+DEFAULT_TZ_INFO = ZoneInfo(DEFAULT_TIMEZONE)
+
+@lru_cache(maxsize=8)
+def _zoneinfo(name: str) -> ZoneInfo:
+    """Get a (cached) ZoneInfo by name, falling back to DEFAULT_TZ_INFO if unknown."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning("Unknown timezone %r, using %s", name, DEFAULT_TIMEZONE)
+        return DEFAULT_TZ_INFO
+
+def resolve_today() -> date_cls:
+    """Get today's date in the system timezone."""
+    return datetime.now(_zoneinfo(get_system_timezone())).date()
+
+_DEFAULT_COORDS = (DEFAULT_LAT, DEFAULT_LON)
 
 def resolve_coordinates(lat: float | None, lon: float | None) -> tuple[float, float]:
     """Resolve coordinates, using defaults if not provided."""
     if lat is not None and lon is not None:
         return (lat, lon)
-    return (DEFAULT_LAT, DEFAULT_LON)
+    return _DEFAULT_COORDS
+
+def query_coordinates(
+    lat: float | None = Query(None, ge=-90, le=90),
+    lon: float | None = Query(None, ge=-180, le=180),
+) -> tuple[float, float]:
+    """Resolve the optional lat/lon query parameters shared by /weather endpoints."""
+    return resolve_coordinates(lat, lon)
 
-def get_weather_by_date_and_location(db: Session, date: date_cls | str, lat: float, lon: float) -> WeatherData | None:
+def path_date(date: str) -> date_cls:
+    """Parse the {date} path parameter (YYYY-MM-DD)."""
+    try:
+        return date_cls.fromisoformat(date)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid date format. Use YYYY-MM-DD")
+
+# Built once; SQLAlchemy's compiled cache then reuses the SQL for every request.
+# Selects plain columns, so results are lightweight Rows rather than ORM objects.
+_WEATHER_STMT = select(
+    WeatherData.date,
+    WeatherData.high_temp_f,
+    WeatherData.low_temp_f,
+    WeatherData.location_name,
+    WeatherData.latitude,
+    WeatherData.longitude,
+).where(
+    WeatherData.date == bindparam("d"),
+    WeatherData.latitude == bindparam("la"),
+    WeatherData.longitude == bindparam("lo"),
+)
+
+def get_weather_by_date_and_location(db: Session, date: date_cls, lat: float, lon: float) -> Row | None:
     """Query weather data for a specific date and location coordinates."""
-    # Convert string to date if needed
-    if isinstance(date, str):
-        date = date_cls.fromisoformat(date)
-    return db.execute(
-        select(WeatherData).where(
-            WeatherData.date == date,
-            WeatherData.latitude == lat,
-            WeatherData.longitude == lon
-        )
-    ).scalar_one_or_none()
-
-def format_weather_response(row: WeatherData) -> dict[str, str | float]:
-    """Format a WeatherData row as an API response."""
+    return db.execute(_WEATHER_STMT, {"d": date, "la": lat, "lo": lon}).one_or_none()
+
+def format_weather_response(row: Row) -> dict[str, str | float]:
+    """
+    Format a weather_data row as an API response.
+
+    The dict matches WeatherDataOut as FastAPI would serialize it (aliased
+    keys, field order), so endpoints return it directly via json_response(),
+    skipping response-model validation.
+    """
     return {
         "date": row.date.isoformat(),
-        "high_temp": row.high_temp_f,
-        "low_temp": row.low_temp_f,
+        "high_temp_f": row.high_temp_f,
+        "low_temp_f": row.low_temp_f,
+        "units": "F",
         "location_name": row.location_name,
         "latitude": row.latitude,
         "longitude": row.longitude,
-        "units": "F",
     }
 
+def json_response(content: dict) -> Response:
+    """
+    Serialize trusted, already-shaped data straight to a JSON response with orjson.
+
+    Returning a Response bypasses FastAPI's response_model validation; the
+    response_model on the route still documents the schema in OpenAPI.
+    """
+    return Response(content=orjson.dumps(content), media_type="application/json")
+
+# ==============================================================
+# RESPONSE CACHE
+# ==============================================================
+
+# Weather rows only change when the ingest job upserts them. Past dates are
+# effectively final; today and future dates are forecasts that may be
+# refreshed, so those expire sooner. Misses (404s) are never cached.
+WEATHER_CACHE_MAX_ENTRIES = 4096
+WEATHER_CACHE_TTL_PAST = 24 * 3600
+WEATHER_CACHE_TTL_CURRENT = 900
+
+# (date, lat, lon) -> (expires_at, response), in least-recently-used order
+_weather_cache: OrderedDict[tuple[date_cls, float, float], tuple[float, dict]] = OrderedDict()
+_weather_cache_lock = threading.Lock()
+
+def get_cached_weather_response(db: Session, d: date_cls, lat: float, lon: float) -> dict | None:
+    """
+    Get the formatted weather response for a date and location, using the cache.
+
+    Args:
+        db: Database session (only used on a cache miss)
+        d: Forecast date
+        lat: Latitude coordinate
+        lon: Longitude coordinate
+
+    Returns:
+        dict: Formatted response, or None if there is no data
+    """
+    key = (d, lat, lon)
+    now = time.monotonic()
+    with _weather_cache_lock:
+        entry = _weather_cache.get(key)
+        if entry is not None and entry[0] > now:
+            _weather_cache.move_to_end(key)
+            return entry[1]
+
+    row = get_weather_by_date_and_location(db, d, lat, lon)
+    if row is None:
+        return None
+    response = format_weather_response(row)
+
+    today = resolve_today()
+    ttl = WEATHER_CACHE_TTL_PAST if d < today else WEATHER_CACHE_TTL_CURRENT
+    with _weather_cache_lock:
+        _weather_cache[key] = (now + ttl, response)
+        _weather_cache.move_to_end(key)
+        if len(_weather_cache) > WEATHER_CACHE_MAX_ENTRIES:
+            _weather_cache.popitem(last=False)
+    return response
+
+def lookup_weather_response(db: Session, d: date_cls, coords: tuple[float, float],
+                            not_found_detail: str) -> Response:
+    """
+    Look up (via the response cache) and serialize weather for a date and location.
+
+    Raises:
+        HTTPException: 404 with not_found_detail if there is no data
+    """
+    response = get_cached_weather_response(db, d, *coords)
+    if response is None:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    return json_response(response)
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
-@app.get("/ready")
-def ready(db: Session = Depends(get_session)):
-    # Database connectivity check
+# Readiness probes may arrive every second or two; the database is actually
+# queried at most once per READY_CHECK_TTL seconds and the result reused.
+READY_CHECK_TTL = 5.0
+
+_ready_checked_at = float("-inf")
+_ready_ok = False
+_ready_refreshing = False
+_ready_lock = threading.Lock()
+
+def check_database() -> bool:
+    """Run SELECT 1 on a pooled connection (no Session or ORM compilation)."""
     try:
-        db.execute(select(WeatherData).limit(1))
-        return {"status": "ready"}
+        with engine.connect() as conn:
+            conn.exec_driver_sql("SELECT 1")
+        return True
     except Exception as e:
-        logger.error(f"Database health check failed: {e}")
+        logger.error("Database health check failed: %s", e)
+        return False
+
+@app.get("/ready")
+def ready():
+    global _ready_checked_at, _ready_ok, _ready_refreshing
+    # The lock only guards the cached state. One caller at a time refreshes it,
+    # outside the lock, so a slow database doesn't stall concurrent probes;
+    # they get the cached result meanwhile.
+    with _ready_lock:
+        refresh = (not _ready_refreshing
+                   and time.monotonic() - _ready_checked_at >= READY_CHECK_TTL)
+        if refresh:
+            _ready_refreshing = True
+        ok = _ready_ok
+
+    if refresh:
+        ok = check_database()
+        with _ready_lock:
+            _ready_ok = ok
+            _ready_checked_at = time.monotonic()
+            _ready_refreshing = False
+
+    if not ok:
         raise HTTPException(status_code=503, detail="Database unavailable")
+    return {"status": "ready", "pool": engine.pool.status()}
 
 @app.get("/weather/today", response_model=WeatherDataOut)
 def weather_today(
-    lat: float | None = Query(None, ge=-90, le=90),
-    lon: float | None = Query(None, ge=-180, le=180),
+    coords: tuple[float, float] = Depends(query_coordinates),
     db: Session = Depends(get_session),
 ):
-    today = resolve_today()
-    resolved_lat, resolved_lon = resolve_coordinates(lat, lon)
-    row = get_weather_by_date_and_location(db, today, resolved_lat, resolved_lon)
-    if not row:
-        raise HTTPException(status_code=404, detail="No data for today at this location")
-    return format_weather_response(row)
+    return lookup_weather_response(db, resolve_today(), coords,
+                                   "No data for today at this location")
 
 @app.get("/weather/{date}", response_model=WeatherDataOut)
 def weather_by_date(
-    date: str,
-    lat: float | None = Query(None, ge=-90, le=90),
-    lon: float | None = Query(None, ge=-180, le=180),
+    d: date_cls = Depends(path_date),
+    coords: tuple[float, float] = Depends(query_coordinates),
     db: Session = Depends(get_session),
 ):
-    try:
-        d = date_cls.fromisoformat(date)
-    except ValueError:
-        raise HTTPException(status_code=422, detail="Invalid date format. Use YYYY-MM-DD")
-
-    resolved_lat, resolved_lon = resolve_coordinates(lat, lon)
-    row = get_weather_by_date_and_location(db, d, resolved_lat, resolved_lon)
-    if not row:
-        raise HTTPException(status_code=404, detail="No data for that date at this location")
-    return format_weather_response(row)
+    return lookup_weather_response(db, d, coords,
+                                   "No data for that date at this location")
 
 
 # ==============================================================
@@ -207,13 +362,13 @@ def create_city_graph_nodes(request: CreateCityGraphNodesRequest):
     try:
         # If coordinates not provided, geocode the city name
         if request.latitude is None or request.longitude is None:
-            logger.info(f"Geocoding {request.city_name}...")
+            logger.info("Geocoding %s...", request.city_name)
             location = resolve_location(request.city_name)
             latitude = location.latitude
             longitude = location.longitude
             state = request.state or location.state or "US"
             city_name = location.city or request.city_name
-            logger.info(f"Resolved to: {location.display_name}")
+            logger.info("Resolved to: %s", location.display_name)
         else:
             latitude = request.latitude
             longitude = request.longitude
@@ -224,19 +379,28 @@ def create_city_graph_nodes(request: CreateCityGraphNodesRequest):
         if len(state) != 2:
             state = "US"
 
-        # Create Location node
-        location_info = create_location_node(
-            city_name,
-            state,
-            latitude,
-            longitude
-        )
+        # Fetch from weather.gov before borrowing a pooled connection, so no
+        # connection (or open transaction) is held across the HTTP round-trip
+        temp_rows, humidity_rows = fetch_weather_rows(city_name, latitude, longitude)
+
+        # One transaction for all three phases
+        with age_cursor() as (cur, conn):
+            # Create weather nodes
+            nodes_created = write_weather_nodes(city_name, temp_rows, humidity_rows, cur=cur)
+
+            # Create Location node
+            location_info = create_location_node(
+                city_name,
+                state,
+                latitude,
+                longitude,
+                cur=cur
+            )
 
-        # Create weather nodes
-        nodes_created = create_weather_nodes_from_api(city_name, latitude, longitude)
+            # Create edges
+            edges_created = create_edges_for_city(city_name, cur=cur)
 
-        # Create edges
-        edges_created = create_edges_for_city(city_name)
+            conn.commit()
 
         return {
             "city": city_name,
@@ -248,8 +412,8 @@ def create_city_graph_nodes(request: CreateCityGraphNodesRequest):
             "edges_created": edges_created
         }
     except ValueError as e:
-        logger.error(f"Geocoding error for {request.city_name}: {e}")
+        logger.error("Geocoding error for %s: %s", request.city_name, e)
         raise HTTPException(status_code=400, detail=f"Could not find location: {str(e)}")
     except Exception as e:
-        logger.error(f"Error creating graph nodes for {request.city_name}: {e}")
+        logger.error("Error creating graph nodes for %s: %s", request.city_name, e)
         raise HTTPException(status_code=500, detail=f"Failed to create graph nodes: {str(e)}")
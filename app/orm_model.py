@@ -5,7 +5,7 @@ from sqlalchemy import create_engine, Column, Integer, Date, Float, String, Uniq
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from pydantic import BaseModel, Field
 
-from .config import DATABASE_URL
+from .config import DATABASE_URL, DB_POOL_SIZE
 
 
 # ==============================================================
@@ -15,15 +15,30 @@ from .config import DATABASE_URL
 class Base(DeclarativeBase):
     pass
 
+# Bump when the table/index definitions below change, so running containers
+# re-run create_all and upgrade_schema() on their next start
+SCHEMA_VERSION = 3
+
+# Response columns INCLUDEd in the unique (date, lat, lon) index, so the API
+# lookup is answered index-only
+LOOKUP_INCLUDE_COLUMNS = ["high_temp_f", "low_temp_f", "location_name"]
+
 # Connection pool configuration
 engine = create_engine(
     DATABASE_URL,
     future=True,
-    pool_size=5,           # Number of persistent connections
-    max_overflow=10,       # Additional connections when pool is exhausted
-    pool_timeout=30,       # Seconds to wait for available connection
-    pool_recycle=1800,     # Recycle connections after 30 minutes
-    pool_pre_ping=True,    # Verify connection health before use
+    pool_size=DB_POOL_SIZE,  # Number of persistent connections
+    max_overflow=10,         # Additional connections when pool is exhausted
+    pool_timeout=30,         # Seconds to wait for available connection
+    pool_recycle=300,        # Recycle connections after 5 minutes
+    # Dead connections are detected by TCP keepalives rather than a pre-ping
+    # query on every checkout
+    connect_args={
+        "keepalives": 1,
+        "keepalives_idle": 30,
+        "keepalives_interval": 10,
+        "keepalives_count": 5,
+    },
 )
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
@@ -46,12 +61,15 @@ class WeatherData(Base):
     latitude = Column(Float, nullable=False)  # e.g., 34.7298
     longitude = Column(Float, nullable=False)  # e.g., -86.5859
 
-    # Enforce uniqueness per (date, lat, lon) to allow multiple cities in DB
+    # Enforce uniqueness per (date, lat, lon) to allow multiple cities in DB.
+    # The constraint's index also covers the API lookup (see
+    # LOOKUP_INCLUDE_COLUMNS), and its leading date column serves date-only filters.
     __table_args__ = (
-        UniqueConstraint("date", "latitude", "longitude", name="uq_weather_data_date_coords"),
-        Index("ix_weather_data_date", "date"),
+        UniqueConstraint(
+            "date", "latitude", "longitude", name="uq_weather_data_date_coords",
+            postgresql_include=LOOKUP_INCLUDE_COLUMNS,
+        ),
         Index("ix_weather_data_location_name", "location_name"),
-        Index("ix_weather_data_coords", "latitude", "longitude"),
     )
 
     def __repr__(self):
@@ -64,6 +82,40 @@ class WeatherData(Base):
         )
 
 
+# create_all never alters a table that already exists, so databases created
+# before the covering unique constraint are upgraded with idempotent DDL: the
+# constraint is rebuilt with INCLUDE columns (only if it lacks them) and the
+# indexes it replaces are dropped.
+_UPGRADE_DDL = (
+    f"""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_constraint c
+            JOIN pg_index i ON i.indexrelid = c.conindid
+            WHERE c.conname = 'uq_weather_data_date_coords'
+              AND i.indnatts > i.indnkeyatts
+        ) THEN
+            ALTER TABLE weather_data DROP CONSTRAINT IF EXISTS uq_weather_data_date_coords;
+            ALTER TABLE weather_data ADD CONSTRAINT uq_weather_data_date_coords
+                UNIQUE (date, latitude, longitude)
+                INCLUDE ({", ".join(LOOKUP_INCLUDE_COLUMNS)});
+        END IF;
+    END $$
+    """,
+    "DROP INDEX IF EXISTS ix_weather_data_lookup_cov",
+    "DROP INDEX IF EXISTS ix_weather_data_date",
+    "DROP INDEX IF EXISTS ix_weather_data_coords",
+)
+
+
+def upgrade_schema():
+    """Bring the indexes of an existing weather_data table up to date (idempotent)."""
+    with engine.begin() as conn:
+        for statement in _UPGRADE_DDL:
+            conn.exec_driver_sql(statement)
+
+
 # ==============================================================
 # API SCHEMAS (Pydantic)
 # ==============================================================
@@ -8,10 +8,13 @@ Usage:
     python -m app.restore_from_backup
 """
 
+import os
 from pathlib import Path
 
-import pandas as pd
 import psycopg
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from psycopg import sql
 
 from .config import (
@@ -20,6 +23,9 @@ from .config import (
 
 logger = get_logger(__name__)
 
+# Rows per Parquet record batch streamed into COPY
+RESTORE_BATCH_SIZE = 64_000
+
 
 def find_latest_backup(prefix: str, suffix: str) -> Path:
     """
@@ -35,18 +41,24 @@ def find_latest_backup(prefix: str, suffix: str) -> Path:
     Raises:
         RuntimeError: If no matching backup files exist
     """
-    # Filter files matching pattern and sort by modification time (oldest first)
-    candidates = sorted(
-        [p for p in BACKUP_DIR.iterdir()
-         if p.is_file() and p.name.startswith(prefix) and p.name.endswith(suffix)],
-        key=lambda p: p.stat().st_mtime,
-    )
-    if not candidates:
+    # Single directory pass keeping the most recently modified match
+    latest = None
+    latest_mtime = -1.0
+    with os.scandir(BACKUP_DIR) as entries:
+        for entry in entries:
+            if not (entry.name.startswith(prefix) and entry.name.endswith(suffix)):
+                continue
+            if not entry.is_file():
+                continue
+            mtime = entry.stat().st_mtime
+            if mtime > latest_mtime:
+                latest_mtime, latest = mtime, entry.path
+
+    if latest is None:
         raise RuntimeError(
             f"No backups matching {prefix}*{suffix} found in {BACKUP_DIR}"
         )
-    # Return last element (most recent by modification time)
-    return candidates[-1]
+    return Path(latest)
 
 
 # -----------------------
@@ -59,9 +71,9 @@ def restore_postgres() -> None:
 
     Process:
     1. Find the latest backup file by modification time
-    2. Read the Parquet file into a DataFrame
-    3. TRUNCATE the existing table (fast delete, resets auto-increment)
-    4. Bulk load data using PostgreSQL COPY (fastest insert method)
+    2. TRUNCATE the existing table (fast delete, resets auto-increment)
+    3. Stream the Parquet file in record batches, writing each batch as CSV
+       into a single PostgreSQL COPY (fastest insert method; no per-row Python)
 
     Raises:
         RuntimeError: If no backup files exist or database/file errors occur
@@ -74,8 +86,9 @@ def restore_postgres() -> None:
     logger.info("Connecting to Postgres...")
     with get_postgres_connection() as conn:
         try:
-            logger.info("Reading backup...")
-            df = pd.read_parquet(parquet_path)
+            logger.info("Opening backup...")
+            parquet_file = pq.ParquetFile(parquet_path)
+            total_rows = parquet_file.metadata.num_rows
 
             # TRUNCATE is faster than DELETE and resets sequences
             logger.info(f"Truncating table {WEATHER_TABLE}...")
@@ -83,28 +96,34 @@ def restore_postgres() -> None:
                 cur.execute(sql.SQL("TRUNCATE TABLE {}").format(sql.Identifier(WEATHER_TABLE)))
 
             # Build COPY statement with column names for bulk insert
-            logger.info(f"Loading {len(df)} rows...")
-            col_identifiers = sql.SQL(", ").join([sql.Identifier(c) for c in df.columns])
-            copy_sql = sql.SQL("COPY {} ({}) FROM STDIN").format(
+            logger.info(f"Loading {total_rows} rows...")
+            col_identifiers = sql.SQL(", ").join(
+                [sql.Identifier(c) for c in parquet_file.schema_arrow.names]
+            )
+            copy_sql = sql.SQL("COPY {} ({}) FROM STDIN (FORMAT CSV)").format(
                 sql.Identifier(WEATHER_TABLE),
                 col_identifiers
             )
 
-            # Use COPY protocol for high-performance bulk loading
+            # Use COPY protocol for high-performance bulk loading. Each batch is
+            # serialized to CSV by Arrow (in C++) and sent in one write; nulls
+            # become unquoted empty fields, which COPY reads as NULL.
+            write_options = pacsv.WriteOptions(include_header=False)
             with conn.cursor() as cur:
-                with cur.copy(copy_sql.as_string(conn)) as copy:
-                    # itertuples() is faster than iterrows() for large DataFrames
-                    for row in df.itertuples(index=False):
-                        copy.write_row(row)
+                with cur.copy(copy_sql) as copy:
+                    for batch in parquet_file.iter_batches(batch_size=RESTORE_BATCH_SIZE):
+                        buf = pa.BufferOutputStream()
+                        pacsv.write_csv(batch, buf, write_options=write_options)
+                        copy.write(memoryview(buf.getvalue()))
 
             conn.commit()
-            logger.info(f"Restored {len(df)} rows to {WEATHER_TABLE}")
+            logger.info(f"Restored {total_rows} rows to {WEATHER_TABLE}")
 
         except psycopg.Error as error:
             conn.rollback()
             logger.error(f"Database error restoring Postgres: {error}")
             raise RuntimeError(f"Database restore failed: {error}") from error
-        except IOError as error:
+        except (IOError, pa.ArrowException) as error:
             conn.rollback()
             logger.error(f"File error restoring Postgres: {error}")
             raise RuntimeError(f"File read failed: {error}") from error
@@ -0,0 +1,35 @@
+"""
+US state name to postal abbreviation lookups, shared across modules.
+
+The mapping is read-only and its strings are interned, so every module shares
+one copy and membership tests can short-circuit on identity.
+
+Usage:
+    from app.state_codes import STATE_ABBREV, STATE_CODES
+
+    STATE_ABBREV["Colorado"]    # "CO"
+    "CO" in STATE_CODES         # True
+"""
+
+import sys
+from types import MappingProxyType
+
+# US state name to abbreviation mapping
+STATE_ABBREV = MappingProxyType({sys.intern(name): sys.intern(code) for name, code in {
+    "Alabama": "AL", "Alaska": "AK", "Arizona": "AZ", "Arkansas": "AR",
+    "California": "CA", "Colorado": "CO", "Connecticut": "CT", "Delaware": "DE",
+    "Florida": "FL", "Georgia": "GA", "Hawaii": "HI", "Idaho": "ID",
+    "Illinois": "IL", "Indiana": "IN", "Iowa": "IA", "Kansas": "KS",
+    "Kentucky": "KY", "Louisiana": "LA", "Maine": "ME", "Maryland": "MD",
+    "Massachusetts": "MA", "Michigan": "MI", "Minnesota": "MN", "Mississippi": "MS",
+    "Missouri": "MO", "Montana": "MT", "Nebraska": "NE", "Nevada": "NV",
+    "New Hampshire": "NH", "New Jersey": "NJ", "New Mexico": "NM", "New York": "NY",
+    "North Carolina": "NC", "North Dakota": "ND", "Ohio": "OH", "Oklahoma": "OK",
+    "Oregon": "OR", "Pennsylvania": "PA", "Rhode Island": "RI", "South Carolina": "SC",
+    "South Dakota": "SD", "Tennessee": "TN", "Texas": "TX", "Utah": "UT",
+    "Vermont": "VT", "Virginia": "VA", "Washington": "WA", "West Virginia": "WV",
+    "Wisconsin": "WI", "Wyoming": "WY", "District of Columbia": "DC"
+}.items()})
+
+# Set of valid 2-letter state codes, for membership tests
+STATE_CODES = frozenset(STATE_ABBREV.values())
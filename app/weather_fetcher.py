@@ -32,12 +32,42 @@ Note:
 from datetime import date, datetime
 from typing import Optional
 
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from .config import USER_AGENT, API_TIMEOUT, get_logger
+from .config import USER_AGENT, API_TIMEOUT, CACHE_DIR, get_logger
+from .json_cache import JsonFileCache
 
 logger = get_logger(__name__)
 
+# A point's forecast grid practically never changes, so the /points lookup is
+# cached on disk (shared by the API, scripts and Airflow) for weeks
+POINTS_CACHE_TTL_DAYS = 30
+
+# Point metadata fields kept in the cache (forecast URLs and grid info)
+POINT_METADATA_KEYS = (
+    "forecast", "forecastHourly", "forecastGridData",
+    "gridId", "gridX", "gridY", "timeZone",
+)
+
+# Retry policy for transient weather.gov failures: connection errors and
+# 502/503/504 responses are retried with exponential backoff (0.2s, 0.4s, ...).
+# Once retries are exhausted the last response is returned and handled by
+# raise_for_status().
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.2,
+    status_forcelist=[502, 503, 504],
+    raise_on_status=False,
+)
+
+_points_disk_cache = JsonFileCache(
+    CACHE_DIR / "points.json", ttl_seconds=POINTS_CACHE_TTL_DAYS * 24 * 3600
+)
+
 
 class WeatherAPIError(Exception):
     """Base exception for weather API errors."""
@@ -76,6 +106,13 @@ class WeatherAPI:
         self.timeout = timeout or API_TIMEOUT
         self._points_cache = {}
 
+        # Pooled session so repeated calls reuse keep-alive TLS connections
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=_RETRY)
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update(self.headers)
+
     def _get(self, url: str) -> dict:
         """
         Make a GET request to the API.
@@ -91,9 +128,10 @@ class WeatherAPI:
             WeatherAPIError: For other API errors
         """
         try:
-            resp = requests.get(url, headers=self.headers, timeout=self.timeout)
+            resp = self._session.get(url, timeout=self.timeout)
             resp.raise_for_status()
-            return resp.json()
+            # orjson parses the raw UTF-8 bytes directly (grid payloads are large)
+            return orjson.loads(resp.content)
         except requests.HTTPError as e:
             if e.response.status_code == 404:
                 raise LocationNotFoundError(
@@ -102,6 +140,8 @@ class WeatherAPI:
             raise WeatherAPIError(f"API request failed: {e}") from e
         except requests.RequestException as e:
             raise WeatherAPIError(f"Request failed: {e}") from e
+        except orjson.JSONDecodeError as e:
+            raise WeatherAPIError(f"Invalid JSON response: {e}") from e
 
     def get_point_metadata(self, lat: float, lon: float) -> dict:
         """
@@ -110,12 +150,16 @@ class WeatherAPI:
         This is the first step in the weather.gov API flow. Returns information
         about the forecast grid that covers the given coordinates.
 
+        Results are cached in memory per instance and on disk across processes
+        (see POINTS_CACHE_TTL_DAYS), so the HTTP call is made once per point.
+
         Args:
             lat: Latitude coordinate (must be within US)
             lon: Longitude coordinate (must be within US)
 
         Returns:
-            dict: Point metadata including forecast URLs and grid info
+            dict: Point metadata (see POINT_METADATA_KEYS) including forecast
+                  URLs and grid info
 
         Raises:
             LocationNotFoundError: If coordinates are outside US coverage
@@ -123,9 +167,13 @@ class WeatherAPI:
         cache_key = f"{lat:.4f},{lon:.4f}"
 
         if cache_key not in self._points_cache:
-            url = f"{self.BASE_URL}/points/{lat:.4f},{lon:.4f}"
-            data = self._get(url)
-            self._points_cache[cache_key] = data["properties"]
+            metadata = _points_disk_cache.get(cache_key)
+            if metadata is None:
+                url = f"{self.BASE_URL}/points/{cache_key}"
+                properties = self._get(url)["properties"]
+                metadata = {key: properties.get(key) for key in POINT_METADATA_KEYS}
+                _points_disk_cache.set(cache_key, metadata)
+            self._points_cache[cache_key] = metadata
 
         return self._points_cache[cache_key]
 
@@ -157,34 +205,31 @@ class WeatherAPI:
         data = self._get(forecast_url)
         periods = data["properties"]["periods"]
 
-        # Group periods by date (alternating day/night)
-        daily_data = {}
+        # Periods arrive in chronological order, alternating day/night, so each
+        # date's periods are contiguous. Walk them once, emitting a day when the
+        # date changes and skipping days missing a high or a low.
+        result = []
+        current_date = None
+        high = low = None
         for period in periods:
             date_str = period["startTime"][:10]
-            d = date.fromisoformat(date_str)
-
-            temp = period["temperature"]
-            is_daytime = period["isDaytime"]
-
-            if d not in daily_data:
-                daily_data[d] = {"high": None, "low": None}
-
-            if is_daytime:
-                daily_data[d]["high"] = temp
+            if date_str != current_date:
+                if high is not None and low is not None:
+                    result.append({
+                        "date": date.fromisoformat(current_date),
+                        "high_temp": float(high),
+                        "low_temp": float(low)
+                    })
+                current_date, high, low = date_str, None, None
+
+            if period["isDaytime"]:
+                high = period["temperature"]
             else:
-                daily_data[d]["low"] = temp
-
-        # Build result list, filtering incomplete days
-        result = []
-        for d, temps in sorted(daily_data.items()):
-            high = temps["high"]
-            low = temps["low"]
-
-            if high is None or low is None:
-                continue
+                low = period["temperature"]
 
+        if high is not None and low is not None:
             result.append({
-                "date": d,
+                "date": date.fromisoformat(current_date),
                 "high_temp": float(high),
                 "low_temp": float(low)
             })
@@ -259,35 +304,41 @@ def parse_grid_values(grid_data: dict, property_name: str,
     prop = grid_data[property_name]
     values = prop.get("values", [])
     unit = prop.get("uom", "")
+    if not values:
+        return []
 
-    result = []
-    for item in values:
-        valid_time = item.get("validTime", "")
-        if "/" in valid_time:
-            timestamp_str = valid_time.split("/")[0]
-        else:
-            timestamp_str = valid_time
-
-        try:
-            if "+" in timestamp_str:
-                timestamp_str = timestamp_str.rsplit("+", 1)[0]
-            elif timestamp_str.endswith("Z"):
-                timestamp_str = timestamp_str[:-1]
-            timestamp = datetime.fromisoformat(timestamp_str)
-        except ValueError:
-            continue
-
-        value = item.get("value")
-        if value is None:
-            continue
-
-        # Convert Celsius to Fahrenheit if needed
-        if convert_celsius and "degC" in unit:
-            value = value * 9 / 5 + 32
-
-        result.append((timestamp, round(value, 2)))
-
-    return result
+    # The first 19 characters of validTime are the period start
+    # ("YYYY-MM-DDTHH:MM:SS"); the UTC offset and duration are dropped
+    starts = [item.get("validTime", "")[:19] for item in values]
+    try:
+        timestamps = np.array(starts, dtype="datetime64[s]")
+    except ValueError:
+        # Malformed entry somewhere: parse one by one, marking bad ones NaT
+        timestamps = np.array([_parse_start(start) for start in starts], dtype="datetime64[s]")
+
+    # Missing values (None) become NaN, so NumPy finds the rows to keep
+    raw = [item.get("value") for item in values]
+    keep = ~np.isnat(timestamps) & ~np.isnan(np.array(raw, dtype=np.float64))
+    kept = np.flatnonzero(keep).tolist()
+
+    # Values are converted and rounded with Python's round(), not np.round():
+    # integer readings (e.g. humidity) stay ints, and .5 boundaries round the
+    # same way as before (np.round scales by 100 first and turns 36.815 into
+    # 36.82; round() gives 36.81)
+    if convert_celsius and "degC" in unit:
+        converted = [round(raw[i] * 9 / 5 + 32, 2) for i in kept]
+    else:
+        converted = [round(raw[i], 2) for i in kept]
+
+    return list(zip(timestamps[keep].tolist(), converted))
+
+
+def _parse_start(start: str) -> np.datetime64:
+    """Parse one period start timestamp, returning NaT if it is malformed."""
+    try:
+        return np.datetime64(start, "s")
+    except ValueError:
+        return np.datetime64("NaT", "s")
 
 
 # Module-level convenience instance
@@ -7,3 +7,10 @@ SET search_path = ag_catalog, "$user", public;
 
 -- Create the weather graph
 SELECT create_graph('weather_graph');
+
+-- Create the graph labels up front; AGE otherwise creates them lazily, and
+-- concurrent first writes race on the label catalog
+SELECT create_vlabel('weather_graph', 'Location');
+SELECT create_vlabel('weather_graph', 'Temperature');
+SELECT create_vlabel('weather_graph', 'Humidity');
+SELECT create_elabel('weather_graph', 'CONCURRENT_WITH');